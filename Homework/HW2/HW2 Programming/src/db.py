@@ -8,8 +8,13 @@ KV = Dict[str, Any]
 # A Query consists of a string (possibly with placeholders) and a list of values to be put in the placeholders
 Query = Tuple[str, List]
 
+def quote_identifier(name: str) -> str:
+	"""Backtick-quotes a column name, so reserved words such as rank can be used."""
+	return "`" + str(name).replace("`", "``") + "`"
+
 class DB:
-	def __init__(self, host: str, port: int, user: str, password: str, database: str):
+	def __init__(self, host: str, port: int, user: str, password: str, database: str,
+			local_infile: bool = False):
 		conn = pymysql.connect(
 			host=host,
 			port=port,
@@ -18,6 +23,7 @@ class DB:
 			database=database,
 			cursorclass=pymysql.cursors.DictCursor,
 			autocommit=True,
+			local_infile=local_infile,
 		)
 		self.conn = conn
 
@@ -100,6 +106,62 @@ class DB:
 		result = self.execute_query(query, args, False)
 		return result
 
+	@staticmethod
+	def build_insert_many_query(table: str, columns: List[str], rows: List[KV]) -> Tuple[str, List[List]]:
+		"""Builds a query that inserts many rows. See db_test for examples.
+
+		:param table: The table to be inserted into
+		:param columns: The attributes to insert. Rows missing an attribute insert NULL.
+		:param rows: Key-value pairs, one dict per row to be inserted
+		:returns: A query string and one list of placeholder arguments per row
+		"""
+		attrib_clause = " (" + ", ".join(map(quote_identifier, columns)) + ")"
+		placeholder = ["%s"]*len(columns)
+		values_clause = " VALUES (" + ", ".join(map(str, placeholder)) + ")"
+		args = [[r.get(c, None) for c in columns] for r in rows]
+		return f"INSERT INTO {table}" + attrib_clause + values_clause, args
+
+	def insert_many(self, table: str, columns: List[str], rows: List[KV]) -> int:
+		"""Runs a batched insert. pymysql's executemany rewrites the INSERT into
+		multi-row INSERT ... VALUES (...), (...) statements, so this is one round
+		trip per batch instead of one per row.
+
+		:param table: The table to be inserted into
+		:param columns: The attributes to insert
+		:param rows: Key-value pairs, one dict per row to be inserted
+		:returns: The number of rows affected
+		"""
+		if not rows:
+			return 0
+		query, args = self.build_insert_many_query(table, columns, rows)
+		cur = self.get_cursor()
+		return cur.executemany(query, args)
+
+	@staticmethod
+	def build_load_data_query(table: str, columns: List[str], file_name: str) -> str:
+		"""Builds a LOAD DATA LOCAL INFILE statement for a tab separated file with
+		one row per line, \\N for NULL and no header. See db_test for examples.
+
+		:param table: The table to be loaded
+		:param columns: The attributes, in the order they appear in the file
+		:param file_name: The path to the file on the client
+		:returns: A query string
+		"""
+		attrib_clause = " (" + ", ".join(map(quote_identifier, columns)) + ")"
+		return f"LOAD DATA LOCAL INFILE %s INTO TABLE {table}" + \
+			" FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'" + attrib_clause
+
+	def load_data(self, table: str, columns: List[str], file_name: str) -> int:
+		"""Runs a LOAD DATA LOCAL INFILE. The DB must be created with local_infile=True.
+
+		:param table: The table to be loaded
+		:param columns: The attributes, in the order they appear in the file
+		:param file_name: The path to the file on the client
+		:returns: The number of rows affected
+		"""
+		query = self.build_load_data_query(table, columns, file_name)
+		return self.execute_query(query, [file_name], False)
+
 	@staticmethod
 	def build_update_query(table: str, values: KV, filters: KV) -> Query:
 		"""Builds a query that updates rows. See db_test for examples.
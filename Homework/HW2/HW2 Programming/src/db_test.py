@@ -50,6 +50,43 @@ class DBTest(unittest.TestCase):
 
         self.run_test_table(DB.build_insert_query, tests)
 
+    def test_build_insert_many_query(self):
+        tests = [
+            (
+                ("student", ["ID"], []),
+                ("INSERT INTO student (`ID`) VALUES (%s)", [])
+            ),
+            (
+                ("student", ["ID", "name"], [{"ID": 1, "name": "Joe"}, {"ID": 2, "name": "Mike"}]),
+                ("INSERT INTO student (`ID`, `name`) VALUES (%s, %s)", [[1, "Joe"], [2, "Mike"]])
+            ),
+            (
+                ("student", ["ID", "name", "dept_name"], [{"ID": 1, "name": "Joe"}, {"ID": 2, "dept_name": "CS"}]),
+                (
+                    "INSERT INTO student (`ID`, `name`, `dept_name`) VALUES (%s, %s, %s)",
+                    [[1, "Joe", None], [2, None, "CS"]]
+                )
+            ),
+            (
+                # rank is a reserved word since MySQL 8.0.2
+                ("Managers", ["playerID", "rank"], [{"playerID": "wrighha01", "rank": 1}]),
+                ("INSERT INTO Managers (`playerID`, `rank`) VALUES (%s, %s)", [["wrighha01", 1]])
+            ),
+        ]
+
+        self.run_test_table(DB.build_insert_many_query, tests)
+
+    def test_build_load_data_query(self):
+        tests = [
+            (
+                ("student", ["ID", "name"], "/tmp/student.tsv"),
+                "LOAD DATA LOCAL INFILE %s INTO TABLE student"
+                " FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' (`ID`, `name`)"
+            ),
+        ]
+
+        self.run_test_table(DB.build_load_data_query, tests)
+
     def test_build_update_query(self):
         tests = [
             (
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Type definitions
+KV = Dict[str, Any]  # Key-value pairs
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+lahman_files = {
+    "People": os.path.join(data_dir, "HW2 Nonprogramming", "data", "People.csv"),
+    "Teams": os.path.join(data_dir, "HW2 Nonprogramming", "data", "Teams.csv"),
+    "Managers": os.path.join(data_dir, "HW2 Nonprogramming", "data", "Managers.csv"),
+    "HW3 People": os.path.join(data_dir, "..", "HW3", "data", "People.csv"),
+}
+
+# Explicit column types. Codes that repeat across rows (teams, leagues,
+# countries, handedness) are categoricals, counts are nullable ints so that
+# missing values do not turn the column into floats. ERA and FP stay 64 bit,
+# as Float32 would turn 3.55 into 3.549999952316284 in the DOUBLE columns.
+# Columns a file does not have are skipped, so one spec covers both People.csv
+# files.
+lahman_dtypes = {
+    "People": {
+        "playerID": "string", "retroID": "string", "bbrefID": "string",
+        "birthYear": "Int16", "birthMonth": "Int8", "birthDay": "Int8",
+        "birthCountry": "category", "birthState": "category", "birthCity": "string",
+        "deathYear": "Int16", "deathMonth": "Int8", "deathDay": "Int8",
+        "deathCountry": "category", "deathState": "category", "deathCity": "string",
+        "nameFirst": "string", "nameLast": "string", "nameGiven": "string",
+        "weight": "Int16", "height": "Int16", "bats": "category", "throws": "category",
+        "debut": "string", "finalGame": "string",
+    },
+    "Teams": {
+        "yearID": "Int16", "lgID": "category", "teamID": "category", "franchID": "category",
+        "divID": "category", "Rank": "Int8", "G": "Int16", "Ghome": "Int16", "W": "Int16", "L": "Int16",
+        "DivWin": "category", "WCWin": "category", "LgWin": "category", "WSWin": "category",
+        "R": "Int16", "AB": "Int16", "H": "Int16", "2B": "Int16", "3B": "Int16", "HR": "Int16",
+        "BB": "Int16", "SO": "Int16", "SB": "Int16", "CS": "Int16", "HBP": "Int16", "SF": "Int16",
+        "RA": "Int16", "ER": "Int16", "ERA": "Float64", "CG": "Int16", "SHO": "Int16", "SV": "Int16",
+        "IPouts": "Int16", "HA": "Int16", "HRA": "Int16", "BBA": "Int16", "SOA": "Int16", "E": "Int16",
+        "DP": "Int16", "FP": "Float64", "name": "category", "park": "category", "attendance": "Int32",
+        "BPF": "Int16", "PPF": "Int16", "teamIDBR": "category", "teamIDlahman45": "category",
+        "teamIDretro": "category",
+    },
+    "Managers": {
+        "playerID": "category", "yearID": "Int16", "teamID": "category", "lgID": "category",
+        "inseason": "Int8", "G": "Int16", "W": "Int16", "L": "Int16", "rank": "Int8",
+        "plyrMgr": "category",
+    },
+}
+lahman_dtypes["HW3 People"] = lahman_dtypes["People"]
+
+# Only empty fields are missing. pandas' default NA strings would turn the
+# league code "NA" (National Association) into a missing value.
+na_options = {"keep_default_na": False, "na_values": [""]}
+
+default_chunk_size = 50000
+
+
+def get_file_hash(file_name: str) -> str:
+    h = hashlib.sha256()
+    with open(file_name, "rb") as in_file:
+        for block in iter(lambda: in_file.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def get_cache_file_name(file_name: str) -> str:
+    head, tail = os.path.split(file_name)
+    return os.path.join(head, "." + tail + ".cache.pkl")
+
+
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates chunks read with categorical columns. Each chunk has its own
+    categories, which pd.concat would widen to object, so categoricals are
+    unioned column by column instead.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+
+    result = pd.concat(chunks, ignore_index=True)
+    for c in chunks[0].columns:
+        if isinstance(chunks[0][c].dtype, pd.CategoricalDtype):
+            result[c] = union_categoricals([chunk[c] for chunk in chunks])
+    return result
+
+
+def read_lahman_csv(file_name: str, dtypes: KV, chunk_size: int = default_chunk_size) -> pd.DataFrame:
+    """Parses a Lahman CSV with explicit column types, chunk_size rows at a time.
+
+    :param file_name: The CSV file
+    :param dtypes: Column name to pandas dtype. Columns the file does not have are ignored.
+    :param chunk_size: Rows per parsed chunk
+    :returns: The typed DataFrame
+    """
+    columns = pd.read_csv(file_name, nrows=0, **na_options).columns
+    dtype = {c: t for c, t in dtypes.items() if c in columns}
+    chunks = list(pd.read_csv(file_name, dtype=dtype, chunksize=chunk_size, **na_options))
+    return concat_chunks(chunks)
+
+
+def load_lahman(name: str, file_name: Optional[str] = None, use_cache: bool = True,
+                chunk_size: int = default_chunk_size) -> pd.DataFrame:
+    """Loads a Lahman dataset, reusing a pickled sidecar next to the CSV until the CSV changes.
+
+    The sidecar records the column types and NA options it was parsed with
+    and the CSV's size, mtime and SHA-256. A sidecar parsed with different
+    types or options is never reused. Otherwise a matching size and mtime reuses the sidecar
+    without reading the CSV, and a mismatch hashes the CSV and only reparses
+    it if the hash differs (e.g. a fresh checkout only changes the mtime).
+
+    :param name: A key of lahman_dtypes, e.g. "People"
+    :param file_name: The CSV file. Defaults to lahman_files[name].
+    :param use_cache: If False, always parses the CSV and leaves the sidecar alone
+    :param chunk_size: Rows per parsed chunk
+    :returns: The typed DataFrame
+    """
+    file_name = file_name or lahman_files[name]
+    dtypes = lahman_dtypes[name]
+
+    if not use_cache:
+        return read_lahman_csv(file_name, dtypes, chunk_size)
+
+    cache_file_name = get_cache_file_name(file_name)
+    stat = os.stat(file_name)
+    cached = None
+    if os.path.exists(cache_file_name):
+        try:
+            with open(cache_file_name, "rb") as in_file:
+                cached = pickle.load(in_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            cached = None
+
+    parse_spec = {"dtypes": dtypes, "na_options": na_options}
+    if cached and cached.get("parse_spec", None) != parse_spec:
+        cached = None
+
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["frame"]
+
+    file_hash = get_file_hash(file_name)
+    if cached and cached["sha256"] == file_hash:
+        frame = cached["frame"]
+    else:
+        frame = read_lahman_csv(file_name, dtypes, chunk_size)
+
+    with open(cache_file_name, "wb") as out_file:
+        pickle.dump({"parse_spec": parse_spec, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                     "sha256": file_hash, "frame": frame},
+                    out_file, protocol=pickle.HIGHEST_PROTOCOL)
+    return frame
+
+
+def get_rows(frame: pd.DataFrame) -> List[KV]:
+    """Converts a frame to DB rows, with pandas missing values as None."""
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+def insert_lahman(db, table: str, frame: pd.DataFrame, batch_size: int = 5000) -> int:
+    """Bulk inserts a frame into an existing table through DB.insert_many.
+
+    :param db: The DB to insert through
+    :param table: The table to be inserted into. Its columns must match the frame's.
+    :param frame: The frame, e.g. from load_lahman
+    :param batch_size: Rows per multi-row INSERT
+    :returns: The number of rows affected
+    """
+    columns = list(frame.columns)
+    count = 0
+    for start in range(0, len(frame), batch_size):
+        count += db.insert_many(table, columns, get_rows(frame.iloc[start:start + batch_size]))
+    return count
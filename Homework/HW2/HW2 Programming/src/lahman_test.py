@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import pandas as pd
+
+import lahman
+from db import DB
+
+
+class FakeDB:
+    # Builds the same INSERT the real DB runs, without a connection.
+    def __init__(self):
+        self.queries = []
+
+    def insert_many(self, table, columns, rows):
+        self.queries.append(DB.build_insert_many_query(table, columns, rows))
+        return len(rows)
+
+
+class LahmanTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir, "Managers.csv")
+        shutil.copy(lahman.lahman_files["Managers"], self.file_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_read_lahman_csv_types(self):
+        frame = lahman.read_lahman_csv(self.file_name, lahman.lahman_dtypes["Managers"])
+
+        self.assertIsInstance(frame["teamID"].dtype, pd.CategoricalDtype)
+        self.assertEqual("Int8", str(frame["rank"].dtype))
+
+    def test_read_lahman_csv_keeps_na_league(self):
+        # "NA" is the National Association's lgID, not a missing value.
+        frame = lahman.read_lahman_csv(lahman.lahman_files["Teams"], lahman.lahman_dtypes["Teams"])
+
+        self.assertIn("NA", frame["lgID"].cat.categories)
+        self.assertFalse(frame["lgID"].isna().any())
+        self.assertTrue(frame["divID"].isna().any())
+
+    def test_read_lahman_csv_chunks(self):
+        whole = lahman.read_lahman_csv(self.file_name, lahman.lahman_dtypes["Managers"])
+        chunked = lahman.read_lahman_csv(self.file_name, lahman.lahman_dtypes["Managers"], chunk_size=500)
+
+        self.assertIsInstance(chunked["teamID"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(whole.astype(object), chunked.astype(object))
+
+    def test_load_lahman_cache(self):
+        cache_file_name = lahman.get_cache_file_name(self.file_name)
+        first = lahman.load_lahman("Managers", self.file_name)
+        self.assertTrue(os.path.exists(cache_file_name))
+
+        # A stale mtime with the same contents reuses the cached frame.
+        os.utime(self.file_name, ns=(0, 0))
+        second = lahman.load_lahman("Managers", self.file_name)
+        pd.testing.assert_frame_equal(first, second)
+
+        # Changed contents are reparsed.
+        with open(self.file_name, "a") as out_file:
+            out_file.write("testmgr01,2024,NYA,AL,1,1,1,0,1,N\n")
+        third = lahman.load_lahman("Managers", self.file_name)
+        self.assertEqual(len(first) + 1, len(third))
+
+    def test_load_lahman_cache_dtypes(self):
+        lahman.load_lahman("Managers", self.file_name)
+
+        # A sidecar parsed with other column types is not reused.
+        dtypes = dict(lahman.lahman_dtypes["Managers"], rank="Int32")
+        with unittest.mock.patch.dict(lahman.lahman_dtypes, {"Managers": dtypes}):
+            frame = lahman.load_lahman("Managers", self.file_name)
+        self.assertEqual("Int32", str(frame["rank"].dtype))
+
+        frame = lahman.load_lahman("Managers", self.file_name)
+        self.assertEqual("Int8", str(frame["rank"].dtype))
+
+    def test_read_lahman_csv_float_precision(self):
+        frame = lahman.read_lahman_csv(lahman.lahman_files["Teams"], lahman.lahman_dtypes["Teams"])
+        raw = pd.read_csv(lahman.lahman_files["Teams"], usecols=["ERA", "FP"])
+
+        rows = lahman.get_rows(frame[["ERA", "FP"]])
+        self.assertEqual(raw["ERA"].tolist(), [r["ERA"] for r in rows])
+        self.assertEqual(raw["FP"].tolist(), [r["FP"] for r in rows])
+
+    def test_insert_lahman(self):
+        tests = [
+            ("Managers", "rank"),
+            ("Teams", "Rank"),
+        ]
+
+        for name, rank in tests:
+            frame = lahman.load_lahman(name, use_cache=False)
+            db = FakeDB()
+
+            self.assertEqual(len(frame), lahman.insert_lahman(db, name, frame, batch_size=1000))
+            self.assertEqual((len(frame) + 999) // 1000, len(db.queries))
+            query, args = db.queries[0]
+            # rank is a reserved word in MySQL 8, so every column is quoted.
+            self.assertIn(f"`{rank}`", query)
+            self.assertTrue(query.startswith(f"INSERT INTO {name} (`"))
+            self.assertEqual(len(frame), sum(len(args) for _, args in db.queries))
+            self.assertEqual(len(frame.columns), len(args[0]))
+
+    def test_get_rows(self):
+        frame = pd.DataFrame({
+            "teamID": pd.Series(["NYA", None], dtype="category"),
+            "rank": pd.Series([1, None], dtype="Int8"),
+        })
+
+        self.assertEqual([{"teamID": "NYA", "rank": 1}, {"teamID": None, "rank": None}], lahman.get_rows(frame))
+
+
+if __name__ == '__main__':
+    unittest.main()
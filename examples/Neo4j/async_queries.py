@@ -0,0 +1,112 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import neo4j
+import pandas as pd
+
+from neo4j import AsyncGraphDatabase, basic_auth
+
+from simple_examples import query
+
+default_max_sessions = 8
+default_fetch_size = 1000
+
+
+class AsyncQueries:
+    """
+    Async query helper. At most max_sessions sessions are open at once, and
+    records are pulled from the server fetch_size at a time instead of being
+    buffered into one list the way driver.execute_query does.
+    """
+
+    def __init__(self, uri="bolt://localhost:7687", auth=basic_auth("dbuser", "dbuserdbuser"),
+                 max_sessions=default_max_sessions, fetch_size=default_fetch_size):
+        self.driver = AsyncGraphDatabase.driver(uri, auth=auth, max_connection_pool_size=max_sessions)
+        self.sessions = asyncio.Semaphore(max_sessions)
+        self.fetch_size = fetch_size
+
+    async def close(self):
+        await self.driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def stream(self, q, fetch_size=None, **params):
+        """
+        Runs a read query and gives the result to iterate as the server sends
+        the records. The session and its max_sessions slot are held until the
+        async with block exits, so breaking out of the loop early frees them:
+
+            async with aq.stream(q) as records:
+                async for record in records:
+                    ...
+
+        :param q: The Cypher query, passed through query().
+        :param fetch_size: Records per server round trip. Defaults to the helper's fetch_size.
+        :param params: The query parameters.
+        """
+        async with self.sessions:
+            async with self.driver.session(default_access_mode=neo4j.READ_ACCESS,
+                                           fetch_size=fetch_size or self.fetch_size) as session:
+                yield await session.run(query(q), params)
+
+    async def columns(self, q, fetch_size=None, **params):
+        """
+        Runs a read query and returns {column name: list of values}. Values are
+        appended column by column, so no dict is built per record.
+        """
+        async with self.sessions:
+            async with self.driver.session(default_access_mode=neo4j.READ_ACCESS,
+                                           fetch_size=fetch_size or self.fetch_size) as session:
+                result = await session.run(query(q), params)
+                keys = result.keys()
+                values = [[] for _ in keys]
+                async for record in result:
+                    for column, v in zip(values, record):
+                        column.append(v)
+
+        return dict(zip(keys, values))
+
+    async def to_df(self, q, fetch_size=None, **params):
+        return pd.DataFrame(await self.columns(q, fetch_size=fetch_size, **params))
+
+    async def run_all(self, queries, fetch_size=None):
+        """
+        Runs independent read queries concurrently, each in its own session.
+
+        :param queries: A list of (query, params dict) tuples.
+        :param fetch_size: Records per server round trip.
+        :return: One DataFrame per query, in the same order.
+        """
+        return await asyncio.gather(
+            *[self.to_df(q, fetch_size=fetch_size, **params) for q, params in queries]
+        )
+
+
+async def t1():
+    async with AsyncQueries() as aq:
+        async with aq.stream("""
+            MATCH (m:Movie)<-[:ACTED_IN]-(a:Person)
+            RETURN m.title AS movie, collect(a.name) AS cast
+            LIMIT $limit
+        """, limit=10) as records:
+            async for record in records:
+                print("Record = ", record)
+
+
+async def t2():
+    async with AsyncQueries() as aq:
+        movies, people = await aq.run_all([
+            ("MATCH (m:Movie) RETURN m.title AS title, m.released AS released", {}),
+            ("MATCH (p:Person) RETURN p.name AS name, p.born AS born", {}),
+        ])
+        print("Movies = \n", movies.head())
+        print("People = \n", people.head())
+
+
+if __name__ == "__main__":
+    asyncio.run(t1())
@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+
+from async_queries import AsyncQueries
+
+
+class FakeResult:
+    # AsyncResult.keys() is a plain method; records are async-iterated.
+    def __init__(self, keys, rows):
+        self._keys = keys
+        self.rows = rows
+
+    def keys(self):
+        return tuple(self._keys)
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        for r in self.rows:
+            await asyncio.sleep(0)
+            yield tuple(r)
+
+
+class FakeSession:
+    def __init__(self, driver, fetch_size):
+        self.driver = driver
+        self.fetch_size = fetch_size
+
+    async def __aenter__(self):
+        self.driver.open += 1
+        self.driver.max_open = max(self.driver.max_open, self.driver.open)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.driver.open -= 1
+
+    async def run(self, q, params):
+        self.driver.runs.append((q, params, self.fetch_size))
+        await asyncio.sleep(0)
+        return FakeResult(*self.driver.results[q])
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = results
+        self.runs = []
+        self.open = 0
+        self.max_open = 0
+
+    def session(self, default_access_mode=None, fetch_size=None):
+        return FakeSession(self, fetch_size)
+
+    async def close(self):
+        pass
+
+
+class AsyncQueriesTest(unittest.IsolatedAsyncioTestCase):
+    def make_queries(self, results, max_sessions=8):
+        aq = AsyncQueries(max_sessions=max_sessions, fetch_size=50)
+        self.real_driver = aq.driver
+        aq.driver = FakeDriver(results)
+        return aq
+
+    async def asyncTearDown(self):
+        await self.real_driver.close()
+
+    async def test_columns(self):
+        aq = self.make_queries({
+            "MATCH (m) RETURN m.title AS title, m.year AS year": (["title", "year"], [["A", 1], ["B", 2]]),
+        })
+
+        result = await aq.columns("""
+            MATCH (m) RETURN m.title AS title, m.year AS year
+        """, limit=2)
+
+        self.assertEqual({"title": ["A", "B"], "year": [1, 2]}, result)
+        self.assertEqual([("MATCH (m) RETURN m.title AS title, m.year AS year", {"limit": 2}, 50)],
+                         aq.driver.runs)
+
+    async def test_columns_empty(self):
+        aq = self.make_queries({"MATCH (m) RETURN m.title AS title": (["title"], [])})
+
+        self.assertEqual({"title": []}, await aq.columns("MATCH (m) RETURN m.title AS title"))
+
+    async def test_run_all(self):
+        aq = self.make_queries({
+            "Q1": (["a"], [[1], [2], [3]]),
+            "Q2": (["b", "c"], [["x", 1.5]]),
+            "Q3": (["d"], [[True]]),
+        }, max_sessions=2)
+
+        frames = await aq.run_all([("Q1", {}), ("Q2", {"p": 1}), ("Q3", {})], fetch_size=10)
+
+        self.assertEqual([1, 2, 3], frames[0]["a"].tolist())
+        self.assertEqual(["b", "c"], list(frames[1].columns))
+        self.assertEqual([True], frames[2]["d"].tolist())
+        self.assertEqual({10}, {fetch_size for _, _, fetch_size in aq.driver.runs})
+        self.assertLessEqual(aq.driver.max_open, 2)
+
+    async def test_stream(self):
+        aq = self.make_queries({"Q": (["a"], [[1], [2]])})
+
+        async with aq.stream("Q") as records:
+            self.assertEqual([(1,), (2,)], [r async for r in records])
+        self.assertEqual(0, aq.driver.open)
+
+    async def test_stream_break(self):
+        aq = self.make_queries({"Q": (["a"], [[1], [2], [3]])}, max_sessions=1)
+
+        for _ in range(3):
+            async with aq.stream("Q") as records:
+                async for r in records:
+                    self.assertEqual(1, aq.driver.open)
+                    break
+            self.assertEqual(0, aq.driver.open)
+
+        # The only slot was given back, so another query does not wait for it.
+        result = await asyncio.wait_for(aq.columns("Q"), timeout=1)
+        self.assertEqual({"a": [1, 2, 3]}, result)
+        self.assertEqual(1, aq.driver.max_open)
+
+
+if __name__ == '__main__':
+    unittest.main()
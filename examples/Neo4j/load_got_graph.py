@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import cast
+
+from typing_extensions import LiteralString
+
+from simple_examples import cache, driver, query
+
+logger = logging.getLogger(__name__)
+
+# The JSON files process_got.py writes.
+default_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "process_got")
+default_batch_size = 10000
+# Relationship passes lock both end nodes of every row, and the end nodes are
+# shared between writers, so they run in smaller transactions that are cheap
+# to retry after a deadlock.
+default_edge_batch_size = 1000
+default_writers = 4
+
+# Uniqueness constraints also give us the indexes the MERGEs below look up by,
+# so they must exist before any data is loaded.
+constraints = [
+    query("""
+        CREATE CONSTRAINT character_name IF NOT EXISTS
+        FOR (c:Character) REQUIRE c.name IS UNIQUE
+    """),
+    query("""
+        CREATE CONSTRAINT episode_key IF NOT EXISTS
+        FOR (e:Episode) REQUIRE (e.seasonNum, e.episodeNum) IS UNIQUE
+    """),
+    query("""
+        CREATE CONSTRAINT scene_key IF NOT EXISTS
+        FOR (s:Scene) REQUIRE (s.seasonNum, s.episodeNum, s.sceneNum) IS UNIQUE
+    """),
+]
+
+merge_characters = query("""
+    UNWIND $batch AS name
+    MERGE (:Character {name: name})
+""")
+
+merge_episodes = query("""
+    UNWIND $batch AS row
+    MERGE (e:Episode {seasonNum: row.seasonNum, episodeNum: row.episodeNum})
+    SET e += row
+""")
+
+merge_scenes = query("""
+    UNWIND $batch AS row
+    MERGE (e:Episode {seasonNum: row.seasonNum, episodeNum: row.episodeNum})
+    MERGE (s:Scene {seasonNum: row.seasonNum, episodeNum: row.episodeNum, sceneNum: row.sceneNum})
+    SET s += row
+    MERGE (s)-[:IN_EPISODE]->(e)
+""")
+
+merge_appearances = query("""
+    UNWIND $batch AS row
+    MATCH (c:Character {name: row.characterName})
+    MATCH (s:Scene {seasonNum: row.seasonNum, episodeNum: row.episodeNum, sceneNum: row.sceneNum})
+    MERGE (c)-[:APPEARS_IN]->(s)
+""")
+
+
+def get_merge_relationships(relationship):
+    # Cypher cannot take a relationship type as a parameter, so the type is put
+    # into the query text. Only plain identifiers are allowed through.
+    if not re.fullmatch(r"[A-Za-z][A-Za-z0-9_]*", relationship):
+        raise ValueError(f"Invalid relationship type {relationship!r}")
+
+    return cast(LiteralString, query("""
+        UNWIND $batch AS row
+        MATCH (a:Character {name: row.sourceCharacter})
+        MATCH (b:Character {name: row.targetCharacter})
+        MERGE (a)-[:`%s`]->(b)
+    """) % relationship)
+
+
+def get_json(data_dir, file_name):
+    with open(os.path.join(data_dir, file_name), "r") as in_file:
+        return json.load(in_file)
+
+
+def get_batches(rows, batch_size):
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def get_partitions(rows, partition_key, writers, sort_key=None):
+    """
+    Hashes rows into at most writers partitions on partition_key, so all rows
+    that lock a given node go to the same writer. Rows are only disjoint on
+    that key: the other end of a relationship can be locked by several writers.
+    Sorting each partition on sort_key, the shared end, makes transactions take
+    the shared locks in the same order, which keeps deadlocks rare, and
+    execute_write retries the ones that still happen.
+    """
+    partitions = [[] for _ in range(writers)]
+    for r in rows:
+        partitions[hash(partition_key(r)) % writers].append(r)
+
+    if sort_key is not None:
+        for p in partitions:
+            p.sort(key=sort_key)
+
+    return [p for p in partitions if p]
+
+
+def get_relationship_keys(relationships):
+    """
+    Returns (partition_key, sort_key) for character relationship rows. Rows are
+    partitioned on whichever end has more relationships, i.e. the node most
+    writers would otherwise fight over, and sorted on the other, shared end.
+    """
+    degree = Counter()
+    for r in relationships:
+        degree[r["sourceCharacter"]] += 1
+        degree[r["targetCharacter"]] += 1
+
+    def get_ends(r):
+        source, target = r["sourceCharacter"], r["targetCharacter"]
+        if (degree[source], source) >= (degree[target], target):
+            return source, target
+        return target, source
+
+    def partition_key(r):
+        return get_ends(r)[0]
+
+    def sort_key(r):
+        return get_ends(r)[::-1]
+
+    return partition_key, sort_key
+
+
+def write_batch(tx, cypher, batch):
+    tx.run(cypher, batch=batch).consume()
+
+
+def write_partition(drv, cypher, rows, batch_size):
+    count = 0
+    with drv.session() as session:
+        for batch in get_batches(rows, batch_size):
+            session.execute_write(write_batch, cypher, batch)
+            count += len(batch)
+
+    return count
+
+
+def write_rows(cypher, rows, partition_key, drv=driver, batch_size=default_batch_size,
+               writers=default_writers, sort_key=None):
+    """
+    Runs cypher as UNWIND $batch transactions of batch_size rows, with one
+    session per partition.
+
+    :param cypher: A query that starts with UNWIND $batch.
+    :param rows: The rows to write.
+    :param partition_key: Maps a row to its most contended node, e.g. a high degree character.
+    :param drv: The driver to write through.
+    :param batch_size: Rows per transaction.
+    :param writers: Number of concurrent sessions.
+    :param sort_key: Maps a row to the node it shares with other partitions, e.g. the scene.
+    :return: The number of rows written.
+    """
+    if writers <= 1:
+        rows = rows if sort_key is None else sorted(rows, key=sort_key)
+        return write_partition(drv, cypher, rows, batch_size)
+
+    partitions = get_partitions(rows, partition_key, writers, sort_key)
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        counts = pool.map(lambda p: write_partition(drv, cypher, p, batch_size), partitions)
+        return sum(counts)
+
+
+def create_constraints(drv=driver):
+    for c in constraints:
+        drv.execute_query(c)
+
+
+def load_got_graph(data_dir=default_data_dir, drv=driver, batch_size=default_batch_size,
+                   edge_batch_size=default_edge_batch_size, writers=default_writers):
+    create_constraints(drv)
+
+    episodes = get_json(data_dir, "episodes_basics.json")
+    scenes = get_json(data_dir, "episodes_scenes.json")
+    appearances = get_json(data_dir, "episodes_characters.json")
+    relationships = get_json(data_dir, "character_relationships.json")
+
+    names = {a["characterName"] for a in appearances}
+    names.update(r["sourceCharacter"] for r in relationships)
+    names.update(r["targetCharacter"] for r in relationships)
+
+    def episode_key(r):
+        return r["seasonNum"], r["episodeNum"]
+
+    def scene_key(r):
+        return r["seasonNum"], r["episodeNum"], r["sceneNum"], r["characterName"]
+
+    result = {
+        "Character": write_rows(merge_characters, sorted(names), lambda n: n,
+                                drv=drv, batch_size=batch_size, writers=writers),
+        "Episode": write_rows(merge_episodes, episodes, episode_key,
+                              drv=drv, batch_size=batch_size, writers=writers),
+        "Scene": write_rows(merge_scenes, scenes, episode_key,
+                            drv=drv, batch_size=batch_size, writers=writers),
+        # Main characters appear in hundreds of scenes, so APPEARS_IN is
+        # partitioned on the character. Scenes have few characters each and
+        # are locked in scene order.
+        "APPEARS_IN": write_rows(merge_appearances, appearances, lambda r: r["characterName"],
+                                 drv=drv, batch_size=edge_batch_size, writers=writers,
+                                 sort_key=scene_key),
+    }
+
+    by_relationship = {}
+    for r in relationships:
+        by_relationship.setdefault(r["relationship"], []).append(r)
+
+    for relationship, rows in by_relationship.items():
+        partition_key, sort_key = get_relationship_keys(rows)
+        result[relationship] = write_rows(get_merge_relationships(relationship), rows, partition_key,
+                                          drv=drv, batch_size=edge_batch_size, writers=writers,
+                                          sort_key=sort_key)
+
+    # Cached reads from before the load are stale now.
+    cache.invalidate()
+    logger.info("Loaded GoT graph: %s", result)
+    return result
+
+
+if __name__ == "__main__":
+    print(load_got_graph())
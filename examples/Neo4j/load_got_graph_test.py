@@ -0,0 +1,83 @@
+import threading
+import unittest
+
+from load_got_graph import get_partitions, get_relationship_keys, write_rows
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def execute_write(self, func, cypher, batch):
+        with self.driver.lock:
+            self.driver.batches.append(batch)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        return FakeSession(self)
+
+
+class LoadGotGraphTest(unittest.TestCase):
+    def test_get_partitions(self):
+        rows = [{"c": c, "s": s} for s in (3, 1, 2) for c in ("Jon", "Arya", "Sansa", "Tyrion", "Bran")]
+
+        partitions = get_partitions(rows, lambda r: r["c"], 3, sort_key=lambda r: r["s"])
+
+        self.assertLessEqual(len(partitions), 3)
+        self.assertEqual(len(rows), sum(len(p) for p in partitions))
+        # Every character is written by exactly one partition.
+        owners = {}
+        for i, p in enumerate(partitions):
+            for r in p:
+                self.assertEqual(i, owners.setdefault(r["c"], i))
+            self.assertEqual(sorted(r["s"] for r in p), [r["s"] for r in p])
+
+    def test_get_relationship_keys(self):
+        rows = [
+            {"sourceCharacter": "Arya", "targetCharacter": "Meryn"},
+            {"sourceCharacter": "Arya", "targetCharacter": "Walder"},
+            {"sourceCharacter": "Jaqen", "targetCharacter": "Arya"},
+            {"sourceCharacter": "Bran", "targetCharacter": "Hodor"},
+        ]
+        partition_key, sort_key = get_relationship_keys(rows)
+
+        tests = [
+            (rows[0], "Arya", ("Meryn", "Arya")),
+            (rows[1], "Arya", ("Walder", "Arya")),
+            (rows[2], "Arya", ("Jaqen", "Arya")),
+            # Equal degrees fall back to the larger name.
+            (rows[3], "Hodor", ("Bran", "Hodor")),
+        ]
+
+        for r, want_partition, want_sort in tests:
+            self.assertEqual(want_partition, partition_key(r))
+            self.assertEqual(want_sort, sort_key(r))
+
+    def test_write_rows(self):
+        rows = [{"c": c, "s": s} for c in range(20) for s in range(5)]
+
+        for writers in (1, 4):
+            drv = FakeDriver()
+            count = write_rows("UNWIND $batch AS row", rows, lambda r: r["c"], drv=drv,
+                               batch_size=7, writers=writers, sort_key=lambda r: r["s"])
+
+            self.assertEqual(100, count)
+            self.assertTrue(all(len(b) <= 7 for b in drv.batches))
+            self.assertEqual(sorted(map(str, rows)), sorted(str(r) for b in drv.batches for r in b))
+            for b in drv.batches:
+                self.assertEqual(sorted(r["s"] for r in b), [r["s"] for r in b])
+
+
+if __name__ == '__main__':
+    unittest.main()
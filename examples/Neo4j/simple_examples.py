@@ -1,6 +1,10 @@
 
 import logging
 import os
+import re
+import sys
+import time
+from collections import OrderedDict
 from json import dumps
 from textwrap import dedent
 from typing import cast
@@ -22,13 +26,150 @@ def query(q: LiteralString) -> LiteralString:
     return cast(LiteralString, dedent(q).strip())
 
 
+# String literals, quoted identifiers and comments, which can contain any
+# keyword without it being a clause.
+cypher_literals = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`]|``)*`|//[^\n]*|/\*.*?\*/""",
+                             re.DOTALL)
+
+# Clauses that can change the graph. A query containing any of them is never
+# served from or stored in the cache. A keyword right after ".", ":" or "$",
+# or right before ":", is a property, label, parameter or map key instead.
+write_clauses = re.compile(r"(?<![.:$\w])(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b(?!:)",
+                           re.IGNORECASE)
+
+procedure_calls = re.compile(r"(?<![.:$\w])CALL\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+
+# Procedures that only read, so calling them does not make a query a write.
+# Any other procedure may write.
+read_only_procedures = {
+    "db.labels", "db.relationshiptypes", "db.propertykeys", "db.info", "db.ping",
+    "db.schema.visualization", "db.schema.nodetypeproperties", "db.schema.reltypeproperties",
+    "dbms.components", "dbms.procedures", "dbms.functions",
+}
+
+
+def is_write_query(q):
+    q = cypher_literals.sub(lambda m: "x" if m.group(0).startswith("`") else " '' ", q)
+    # So that "n . set" and "{set : 1}" look like "n.set" and "{set:1}".
+    q = re.sub(r"\s*([.:$])\s*", r"\1", q)
+
+    if write_clauses.search(q) is not None:
+        return True
+    return any(name.lower() not in read_only_procedures for name in procedure_calls.findall(q))
+
+
+def get_size(x):
+    """
+    Approximate size in bytes of a query result, following lists, tuples
+    (records are tuples) and dicts.
+    """
+    size = sys.getsizeof(x)
+    if isinstance(x, dict):
+        size += sum(get_size(k) + get_size(v) for k, v in x.items())
+    elif isinstance(x, (list, tuple)):
+        size += sum(get_size(v) for v in x)
+    return size
+
+
+class QueryCache:
+    """
+    LRU cache of read query results keyed on the normalized query text and
+    its parameters. Entries expire after ttl_s seconds, and the least
+    recently used entries are evicted once there are more than max_entries
+    or their total size is over max_bytes.
+    """
+
+    def __init__(self, max_entries=256, ttl_s=300, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(q, params):
+        return q, dumps(params, sort_keys=True, default=str)
+
+    def get(self, key):
+        entry = self.entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, size, value = entry
+        if time.monotonic() > expires:
+            self.remove(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        size = get_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = (time.monotonic() + self.ttl_s, size, value)
+        self.total_bytes += size
+
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def invalidate(self):
+        """
+        Drops every cached result. Call this after loading or changing data.
+        """
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+cache = QueryCache()
+
+
+def cached_query(q, **params):
+    """
+    Runs q through driver.execute_query, serving repeated reads from cache.
+    Write queries always go to the server, and clear the cache.
+
+    :param q: The Cypher query. It is normalized with query().
+    :param params: The query parameters.
+    :return: A new list of the records.
+    """
+    q = query(q)
+
+    if is_write_query(q):
+        records, _, _ = driver.execute_query(q, parameters_=params)
+        cache.invalidate()
+        return records
+
+    key = cache.get_key(q, params)
+    records = cache.get(key)
+    if records is None:
+        records, _, _ = driver.execute_query(q, parameters_=params, routing_=neo4j.RoutingControl.READ)
+        cache.put(key, records)
+
+    # A copy, so that a caller sorting or appending to its result does not
+    # change what later hits get.
+    return list(records)
+
+
 def t1():
-    records, _, _ = driver.execute_query(
-        query("""
+    records = cached_query(
+        """
             MATCH (m:Movie)<-[:ACTED_IN]-(a:Person)
             RETURN m.title AS movie, collect(a.name) AS cast
             LIMIT $limit
-        """),
+        """,
         limit=10
     )
 
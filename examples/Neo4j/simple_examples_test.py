@@ -0,0 +1,157 @@
+import unittest
+from unittest import mock
+
+import simple_examples
+from simple_examples import QueryCache, cached_query, is_write_query
+
+
+class FakeDriver:
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, q, parameters_=None, routing_=None):
+        self.calls.append((q, parameters_))
+        return [("record", len(self.calls))], None, None
+
+
+class QueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        self.cache = QueryCache()
+        patcher = mock.patch.multiple(simple_examples, driver=self.driver, cache=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_read_is_cached(self):
+        first = cached_query("MATCH (n) RETURN n LIMIT $limit", limit=1)
+        # Same query after dedent/strip, same parameters.
+        second = cached_query("""
+            MATCH (n) RETURN n LIMIT $limit
+        """, limit=1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(self.driver.calls))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_parameters_are_part_of_key(self):
+        cached_query("MATCH (n) RETURN n LIMIT $limit", limit=1)
+        cached_query("MATCH (n) RETURN n LIMIT $limit", limit=2)
+
+        self.assertEqual(2, len(self.driver.calls))
+
+    def test_hit_returns_copy(self):
+        first = cached_query("MATCH (n) RETURN n")
+        first.append("mutated")
+        second = cached_query("MATCH (n) RETURN n")
+
+        self.assertEqual([("record", 1)], second)
+        second.clear()
+        self.assertEqual([("record", 1)], cached_query("MATCH (n) RETURN n"))
+
+    def test_write_bypasses_and_invalidates(self):
+        cached_query("MATCH (n) RETURN n")
+        cached_query("MATCH (n) SET n.seen = true")
+        cached_query("MATCH (n) SET n.seen = true")
+        cached_query("MATCH (n) RETURN n")
+
+        self.assertEqual(4, len(self.driver.calls))
+        self.assertEqual(1, len(self.cache.entries))
+
+    def test_read_only_call_is_cached(self):
+        cached_query("MATCH (n) WHERE n.name = 'Set' RETURN n")
+        cached_query("CALL db.labels()")
+        cached_query("CALL db.labels()")
+        cached_query("MATCH (n) WHERE n.name = 'Set' RETURN n")
+
+        self.assertEqual(2, len(self.driver.calls))
+        self.assertEqual(2, len(self.cache.entries))
+
+    def test_invalidate(self):
+        cached_query("MATCH (n) RETURN n")
+        self.cache.invalidate()
+        cached_query("MATCH (n) RETURN n")
+
+        self.assertEqual(2, len(self.driver.calls))
+
+    def test_is_write_query(self):
+        tests = [
+            ("MATCH (n) RETURN n", False),
+            ("MATCH (n) RETURN n.created AS created SKIP 1", False),
+            ("CREATE (n:Person)", True),
+            ("match (a), (b) merge (a)-[:KNOWS]->(b)", True),
+            ("MATCH (n) DETACH DELETE n", True),
+            ("MATCH (n) REMOVE n.x", True),
+            ("LOAD CSV FROM 'file:///x.csv' AS row RETURN row", True),
+            ("MATCH (n) SET n:Seen", True),
+            ("MATCH (n {name: 'x'}) set n.name = 'Set'", True),
+            ("CALL apoc.create.node(['Person'], {})", True),
+            ("CALL { CREATE (n) } RETURN 1", True),
+            ("MATCH (n) CALL db.labels() YIELD label RETURN label", False),
+            ("CALL db.labels()", False),
+            ("CALL dbms.components() YIELD name RETURN name", False),
+            ("CALL { MATCH (n) RETURN n } RETURN n", False),
+            # Keywords in string literals, comments, properties, labels,
+            # parameters, map keys and quoted identifiers.
+            ("MATCH (n) WHERE n.name = 'Set' RETURN n", False),
+            ('MATCH (n) WHERE n.name = "Created by \\"MERGE\\"" RETURN n', False),
+            ("MATCH (n) RETURN n.call, n.set, n . delete", False),
+            ("MATCH (n:Create) RETURN n", False),
+            ("MATCH (n) WHERE n.x = $set RETURN n", False),
+            ("RETURN {set: 1, remove : 2} AS m", False),
+            ("MATCH (n) RETURN n.`create` AS `delete`", False),
+            ("MATCH (n) // TODO: DELETE these\nRETURN n", False),
+            ("MATCH (n) /* SET n.x = 1 */ RETURN n", False),
+            ("MATCH (n) RETURN n.createdAt, n.settings", False),
+        ]
+
+        for q, want in tests:
+            self.assertEqual(want, is_write_query(q), q)
+
+
+class QueryCacheEvictionTest(unittest.TestCase):
+    def test_ttl(self):
+        cache = QueryCache(ttl_s=10)
+        with mock.patch("simple_examples.time.monotonic", return_value=100.0):
+            cache.put("k", [1])
+        with mock.patch("simple_examples.time.monotonic", return_value=109.0):
+            self.assertEqual([1], cache.get("k"))
+        with mock.patch("simple_examples.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+
+        self.assertEqual(0, len(cache.entries))
+        self.assertEqual(0, cache.total_bytes)
+
+    def test_lru_max_entries(self):
+        cache = QueryCache(max_entries=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        cache.get("a")
+        cache.put("c", [3])
+
+        self.assertEqual(["a", "c"], list(cache.entries))
+
+    def test_max_bytes(self):
+        size = simple_examples.get_size(["x" * 100])
+        cache = QueryCache(max_bytes=2 * size)
+        cache.put("a", ["x" * 100])
+        cache.put("b", ["y" * 100])
+        cache.put("c", ["z" * 100])
+
+        self.assertEqual(["b", "c"], list(cache.entries))
+        self.assertEqual(2 * size, cache.total_bytes)
+
+        # A result bigger than the whole cache is not stored.
+        cache.put("big", ["x" * 1000])
+        self.assertNotIn("big", cache.entries)
+
+    def test_put_replaces(self):
+        cache = QueryCache()
+        cache.put("a", [1])
+        cache.put("a", [1, 2, 3])
+
+        self.assertEqual([1, 2, 3], cache.get("a"))
+        self.assertEqual(simple_examples.get_size([1, 2, 3]), cache.total_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
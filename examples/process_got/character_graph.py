@@ -0,0 +1,227 @@
+import json
+import time
+from array import array
+from collections import deque
+
+
+class CharacterGraph:
+    """
+    Compact in-memory graph over the {sourceCharacter, relationship,
+    targetCharacter} rows get_character_relationship produces.
+
+    Character names are interned to ints. Each relationship type gets a CSR
+    (compressed sparse row) adjacency: offsets[i]:offsets[i + 1] is the slice
+    of targets for character i. A second CSR per type is the reverse index.
+    """
+
+    def __init__(self, relationships):
+        self.names = []
+        self.ids = {}
+
+        edges = {}
+        for r in relationships:
+            s = self.intern(r["sourceCharacter"])
+            t = self.intern(r["targetCharacter"])
+            edges.setdefault(r["relationship"], []).append((s, t))
+
+        self.relationship_types = sorted(edges.keys())
+        self.forward = {}
+        self.reverse = {}
+        for rel, pairs in edges.items():
+            self.forward[rel] = self.build_csr(pairs, len(self.names))
+            self.reverse[rel] = self.build_csr([(t, s) for s, t in pairs], len(self.names))
+
+    @classmethod
+    def from_file(cls, file_name="character_relationships.json"):
+        with open(file_name, "r") as in_file:
+            return cls(json.load(in_file))
+
+    def intern(self, name):
+        i = self.ids.get(name, None)
+        if i is None:
+            i = len(self.names)
+            self.ids[name] = i
+            self.names.append(name)
+        return i
+
+    @staticmethod
+    def build_csr(pairs, node_count):
+        counts = [0] * (node_count + 1)
+        for s, _ in pairs:
+            counts[s + 1] += 1
+        for i in range(node_count):
+            counts[i + 1] += counts[i]
+
+        offsets = array("i", counts)
+        targets = array("i", bytes(4 * len(pairs)))
+        fill = list(counts)
+        for s, t in sorted(pairs):
+            targets[fill[s]] = t
+            fill[s] += 1
+
+        return offsets, targets
+
+    def get_id(self, name):
+        i = self.ids.get(name, None)
+        if i is None:
+            raise KeyError(f"Unknown character {name!r}")
+        return i
+
+    def get_adjacency(self, relationships=None, direction="out"):
+        """
+        Returns the CSRs a traversal follows.
+
+        :param relationships: Relationship types to follow. None follows all of them.
+        :param direction: "out" follows source -> target, "in" target -> source, "both" either way.
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Invalid direction {direction!r}")
+
+        rels = self.relationship_types if relationships is None else relationships
+        result = []
+        for rel in rels:
+            if rel not in self.forward:
+                continue
+            if direction in ("out", "both"):
+                result.append(self.forward[rel])
+            if direction in ("in", "both"):
+                result.append(self.reverse[rel])
+
+        return result
+
+    def neighbor_ids(self, i, adjacency):
+        for offsets, targets in adjacency:
+            yield from targets[offsets[i]:offsets[i + 1]]
+
+    def neighbors(self, name, relationships=None, direction="out"):
+        adjacency = self.get_adjacency(relationships, direction)
+        return sorted({self.names[j] for j in self.neighbor_ids(self.get_id(name), adjacency)})
+
+    def k_hop(self, name, k, relationships=None, direction="out"):
+        """
+        Breadth first search out to k hops.
+
+        :return: {character name: hop count} for every character reached, excluding name itself.
+        """
+        adjacency = self.get_adjacency(relationships, direction)
+        start = self.get_id(name)
+        distance = {start: 0}
+        frontier = [start]
+
+        for hop in range(1, k + 1):
+            next_frontier = []
+            for i in frontier:
+                for j in self.neighbor_ids(i, adjacency):
+                    if j not in distance:
+                        distance[j] = hop
+                        next_frontier.append(j)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return {self.names[i]: d for i, d in distance.items() if i != start}
+
+    def shortest_path(self, source, target, relationships=None, direction="out"):
+        """
+        Unweighted shortest path by BFS.
+
+        :return: The list of character names from source to target, or None if target is unreachable.
+        """
+        adjacency = self.get_adjacency(relationships, direction)
+        start = self.get_id(source)
+        goal = self.get_id(target)
+        parent = {start: None}
+        queue = deque([start])
+
+        while queue:
+            i = queue.popleft()
+            if i == goal:
+                path = []
+                while i is not None:
+                    path.append(self.names[i])
+                    i = parent[i]
+                return path[::-1]
+            for j in self.neighbor_ids(i, adjacency):
+                if j not in parent:
+                    parent[j] = i
+                    queue.append(j)
+
+        return None
+
+    def connected_components(self, relationships=None):
+        """
+        Weakly connected components, i.e. edges are followed in both directions.
+
+        :return: Lists of character names, largest component first.
+        """
+        adjacency = self.get_adjacency(relationships, "both")
+        component = [-1] * len(self.names)
+        result = []
+
+        for start in range(len(self.names)):
+            if component[start] != -1:
+                continue
+            component[start] = len(result)
+            members = [start]
+            stack = [start]
+            while stack:
+                i = stack.pop()
+                for j in self.neighbor_ids(i, adjacency):
+                    if component[j] == -1:
+                        component[j] = len(result)
+                        members.append(j)
+                        stack.append(j)
+            result.append(sorted(self.names[i] for i in members))
+
+        result.sort(key=len, reverse=True)
+        return result
+
+
+def time_call(f, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def benchmark(graph, driver=None, source="Eddard Stark", target="Joffrey Baratheon", k=3, repeat=100):
+    """
+    Times the in-memory traversals, and the equivalent Cypher against the graph
+    load_got_graph.py builds when a Neo4j driver is passed in.
+
+    :return: {operation: microseconds per call}
+    """
+    result = {
+        "k_hop": time_call(lambda: graph.k_hop(source, k), repeat),
+        "shortest_path": time_call(lambda: graph.shortest_path(source, target, direction="both"), repeat),
+        "connected_components": time_call(lambda: graph.connected_components(), repeat),
+    }
+
+    if driver is not None:
+        # Relationship types and variable length bounds cannot be parameters in
+        # Cypher. Restricting the types keeps APPEARS_IN edges out of the walk.
+        types = "|".join(f"`{r}`" for r in graph.relationship_types)
+        k_hop_query = """
+            MATCH (a:Character {name: $name})-[:%s*1..%d]->(b:Character)
+            WHERE b <> a
+            RETURN DISTINCT b.name AS name
+        """ % (types, k)
+        shortest_path_query = """
+            MATCH p = shortestPath((a:Character {name: $source})-[:%s*]-(b:Character {name: $target}))
+            RETURN [n IN nodes(p) | n.name] AS path
+        """ % types
+        result["cypher_k_hop"] = time_call(
+            lambda: driver.execute_query(k_hop_query, name=source), repeat)
+        result["cypher_shortest_path"] = time_call(
+            lambda: driver.execute_query(shortest_path_query, source=source, target=target), repeat)
+
+    return result
+
+
+if __name__ == "__main__":
+    from neo4j import GraphDatabase, basic_auth
+
+    the_graph = CharacterGraph.from_file()
+    the_driver = GraphDatabase.driver("bolt://localhost:7687",
+                                      auth=basic_auth("dbuser", "dbuserdbuser"))
+    print(json.dumps(benchmark(the_graph, the_driver), indent=2))
@@ -0,0 +1,111 @@
+import json
+import os
+import unittest
+
+from character_graph import CharacterGraph
+
+
+def rel(source, relationship, target):
+    return {"sourceCharacter": source, "relationship": relationship, "targetCharacter": target}
+
+
+relationships = [
+    rel("Eddard", "parent", "Robb"),
+    rel("Eddard", "parent", "Arya"),
+    rel("Eddard", "sibling", "Benjen"),
+    rel("Arya", "killed", "Meryn"),
+    rel("Arya", "killed", "Walder"),
+    rel("Walder", "killed", "Robb"),
+    rel("Tywin", "parent", "Cersei"),
+    rel("Cersei", "parent", "Joffrey"),
+    rel("Hodor", "servedBy", "Bran"),
+]
+
+
+class CharacterGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = CharacterGraph(relationships)
+
+    def test_csr(self):
+        offsets, targets = self.graph.forward["killed"]
+
+        self.assertEqual(len(self.graph.names) + 1, len(offsets))
+        self.assertEqual(3, len(targets))
+        arya = self.graph.get_id("Arya")
+        self.assertEqual(["Meryn", "Walder"],
+                         sorted(self.graph.names[t] for t in targets[offsets[arya]:offsets[arya + 1]]))
+
+    def test_neighbors(self):
+        tests = [
+            (("Eddard",), ["Arya", "Benjen", "Robb"]),
+            (("Eddard", ["parent"]), ["Arya", "Robb"]),
+            (("Robb", None, "in"), ["Eddard", "Walder"]),
+            (("Arya", None, "both"), ["Eddard", "Meryn", "Walder"]),
+            (("Arya", ["unknown"]), []),
+            (("Meryn",), []),
+        ]
+
+        for args, want in tests:
+            self.assertEqual(want, self.graph.neighbors(*args), args)
+
+    def test_k_hop(self):
+        tests = [
+            (("Eddard", 1), {"Robb": 1, "Arya": 1, "Benjen": 1}),
+            (("Eddard", 2), {"Robb": 1, "Arya": 1, "Benjen": 1, "Meryn": 2, "Walder": 2}),
+            (("Eddard", 5, ["parent"]), {"Robb": 1, "Arya": 1}),
+            (("Joffrey", 2, None, "in"), {"Cersei": 1, "Tywin": 2}),
+            (("Eddard", 0), {}),
+        ]
+
+        for args, want in tests:
+            self.assertEqual(want, self.graph.k_hop(*args), args)
+
+    def test_shortest_path(self):
+        tests = [
+            (("Eddard", "Meryn"), ["Eddard", "Arya", "Meryn"]),
+            (("Eddard", "Eddard"), ["Eddard"]),
+            (("Meryn", "Eddard"), None),
+            (("Meryn", "Eddard", None, "both"), ["Meryn", "Arya", "Eddard"]),
+            (("Eddard", "Robb", ["killed"]), None),
+            (("Tywin", "Eddard", None, "both"), None),
+        ]
+
+        for args, want in tests:
+            self.assertEqual(want, self.graph.shortest_path(*args), args)
+
+    def test_connected_components(self):
+        self.assertEqual([
+            ["Arya", "Benjen", "Eddard", "Meryn", "Robb", "Walder"],
+            ["Cersei", "Joffrey", "Tywin"],
+            ["Bran", "Hodor"],
+        ], self.graph.connected_components())
+        self.assertEqual([["Arya", "Meryn", "Robb", "Walder"]],
+                         self.graph.connected_components(["killed"])[:1])
+
+    def test_k_hop_matches_naive_search(self):
+        file_name = os.path.join(os.path.dirname(os.path.abspath(__file__)), "character_relationships.json")
+        with open(file_name, "r") as in_file:
+            rows = json.load(in_file)
+        graph = CharacterGraph(rows)
+
+        edges = {}
+        for r in rows:
+            edges.setdefault(r["sourceCharacter"], set()).add(r["targetCharacter"])
+
+        for name in sorted(edges)[:50]:
+            want = {}
+            frontier = {name}
+            for hop in range(1, 4):
+                frontier = {t for s in frontier for t in edges.get(s, ())} - set(want) - {name}
+                want.update((t, hop) for t in frontier)
+            self.assertEqual(want, graph.k_hop(name, 3), name)
+
+    def test_errors(self):
+        with self.assertRaises(KeyError):
+            self.graph.k_hop("Nobody", 1)
+        with self.assertRaises(ValueError):
+            self.graph.neighbors("Arya", direction="sideways")
+
+
+if __name__ == '__main__':
+    unittest.main()
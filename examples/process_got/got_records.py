@@ -0,0 +1,120 @@
+import sys
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """
+    Base class for the rows the process_got extractors emit.
+
+    A record stores its values in __slots__ instead of a per-row dict with
+    repeated string keys. It is a read-only Mapping, so it still reads like the
+    dict it replaces: r["seasonNum"], r.get(...), r.keys() and dict(r) all
+    work, pd.DataFrame(records) builds one column per field, and two records
+    or a record and a dict with the same values compare equal.
+
+    Values that repeat across many rows (names, locations) are passed through
+    sys.intern, so every row shares one str object per distinct value.
+    """
+
+    __slots__ = ()
+    fields = ()
+
+    def keys(self):
+        return list(self.fields)
+
+    def values(self):
+        return [getattr(self, k) for k in self.fields]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.fields]
+
+    def __getitem__(self, key):
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.fields:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.fields}
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def intern(v):
+    return sys.intern(v) if isinstance(v, str) else v
+
+
+class LocationRecord(Record):
+    __slots__ = fields = ("seasonNum", "episodeNum", "openingSequenceLocation")
+
+    def __init__(self, seasonNum, episodeNum, openingSequenceLocation):
+        self.seasonNum = seasonNum
+        self.episodeNum = episodeNum
+        self.openingSequenceLocation = intern(openingSequenceLocation)
+
+
+class SceneRecord(Record):
+    __slots__ = fields = ("seasonNum", "episodeNum", "sceneNum", "sceneStart", "sceneEnd",
+                          "sceneLocation", "sceneSubLocation")
+
+    def __init__(self, seasonNum, episodeNum, sceneNum, sceneStart, sceneEnd,
+                 sceneLocation, sceneSubLocation):
+        self.seasonNum = seasonNum
+        self.episodeNum = episodeNum
+        self.sceneNum = sceneNum
+        self.sceneStart = sceneStart
+        self.sceneEnd = sceneEnd
+        self.sceneLocation = intern(sceneLocation)
+        self.sceneSubLocation = intern(sceneSubLocation)
+
+
+class SceneCharacterRecord(Record):
+    __slots__ = fields = ("seasonNum", "episodeNum", "sceneNum", "characterName")
+
+    def __init__(self, seasonNum, episodeNum, sceneNum, characterName):
+        self.seasonNum = seasonNum
+        self.episodeNum = episodeNum
+        self.sceneNum = sceneNum
+        self.characterName = intern(characterName)
+
+
+class RelationshipRecord(Record):
+    __slots__ = fields = ("sourceCharacter", "relationship", "targetCharacter")
+
+    def __init__(self, sourceCharacter, relationship, targetCharacter):
+        self.sourceCharacter = intern(sourceCharacter)
+        self.relationship = intern(relationship)
+        self.targetCharacter = intern(targetCharacter)
+
+
+def record_to_json(o):
+    """
+    json.dump default= hook, so records serialize to the same JSON objects the
+    dict rows did.
+    """
+    if isinstance(o, Record):
+        return o.to_dict()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
@@ -0,0 +1,90 @@
+import io
+import json
+import unittest
+from collections.abc import Mapping
+
+import pandas as pd
+
+from got_records import LocationRecord, SceneRecord, SceneCharacterRecord, RelationshipRecord, \
+    record_to_json
+
+
+class GotRecordsTest(unittest.TestCase):
+    def setUp(self):
+        # Each record next to the dict the extractor used to emit.
+        self.tests = [
+            (
+                LocationRecord(1, 1, "Winterfell"),
+                {"seasonNum": 1, "episodeNum": 1, "openingSequenceLocation": "Winterfell"}
+            ),
+            (
+                SceneRecord(1, 1, 0, "0:00:40", "0:01:45", "The Wall", None),
+                {"seasonNum": 1, "episodeNum": 1, "sceneNum": 0, "sceneStart": "0:00:40",
+                 "sceneEnd": "0:01:45", "sceneLocation": "The Wall", "sceneSubLocation": None}
+            ),
+            (
+                SceneCharacterRecord(1, 1, 0, "Gared"),
+                {"seasonNum": 1, "episodeNum": 1, "sceneNum": 0, "characterName": "Gared"}
+            ),
+            (
+                RelationshipRecord("Arya Stark", "killed", "Walder Frey"),
+                {"sourceCharacter": "Arya Stark", "relationship": "killed", "targetCharacter": "Walder Frey"}
+            ),
+        ]
+
+    def test_reads_like_dict(self):
+        for record, want in self.tests:
+            self.assertIsInstance(record, Mapping)
+            self.assertFalse(hasattr(record, "__dict__"))
+            self.assertEqual(want, record)
+            self.assertEqual(record, want)
+            self.assertEqual(want, dict(record))
+            self.assertEqual(list(want.keys()), list(record.keys()))
+            self.assertEqual(list(want.items()), list(record.items()))
+            self.assertEqual(len(want), len(record))
+            for k, v in want.items():
+                self.assertIn(k, record)
+                self.assertEqual(v, record[k])
+                self.assertEqual(v, record.get(k))
+            self.assertIsNone(record.get("missing"))
+            with self.assertRaises(KeyError):
+                record["missing"]
+
+    def test_equality(self):
+        self.assertEqual(SceneCharacterRecord(1, 1, 0, "Gared"), SceneCharacterRecord(1, 1, 0, "Gared"))
+        self.assertNotEqual(SceneCharacterRecord(1, 1, 0, "Gared"), SceneCharacterRecord(1, 1, 1, "Gared"))
+        self.assertNotEqual(LocationRecord(1, 1, "x"), RelationshipRecord(1, 1, "x"))
+        with self.assertRaises(TypeError):
+            hash(SceneCharacterRecord(1, 1, 0, "Gared"))
+
+    def test_intern(self):
+        a = SceneCharacterRecord(1, 1, 0, "".join(["Ga", "red"]))
+        b = SceneCharacterRecord(1, 1, 1, "".join(["Gar", "ed"]))
+
+        self.assertIs(a["characterName"], b["characterName"])
+
+    def test_data_frame(self):
+        records = [r for r, _ in self.tests if isinstance(r, SceneCharacterRecord)] + \
+            [SceneCharacterRecord(1, 1, 1, "Will")]
+        dicts = [dict(r) for r in records]
+
+        frame = pd.DataFrame(records)
+        self.assertEqual(["seasonNum", "episodeNum", "sceneNum", "characterName"], list(frame.columns))
+        pd.testing.assert_frame_equal(pd.DataFrame(dicts), frame)
+        pd.testing.assert_frame_equal(pd.DataFrame.from_records(dicts), pd.DataFrame.from_records(records))
+
+    def test_json_round_trip(self):
+        records = [r for r, _ in self.tests]
+        dicts = [d for _, d in self.tests]
+
+        out_file = io.StringIO()
+        json.dump(records, out_file, indent=2, default=record_to_json)
+        self.assertEqual(json.dumps(dicts, indent=2), out_file.getvalue())
+        self.assertEqual(records, json.loads(out_file.getvalue()))
+
+        with self.assertRaises(TypeError):
+            json.dumps([object()], default=record_to_json)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import os
+import sys
+import tempfile
+from itertools import chain, islice
+
+from process_got import get_episodes, get_characters, get_episodes_basics, \
+    get_episodes_basics_location, get_episodes_basics_scenes, \
+    get_episodes_basics_scenes_characters, get_character_relationship
+
+
+# Primary key and secondary indexes for each extracted table. The keys come
+# straight from the extractor dicts. Secondary indexes are built after the
+# rows are loaded, which is much cheaper than maintaining them per insert.
+got_tables = {
+    "episodes_basics": {
+        "key": ["seasonNum", "episodeNum"],
+        "indexes": []
+    },
+    "episodes_locations": {
+        "key": ["seasonNum", "episodeNum", "openingSequenceLocation"],
+        "indexes": [["openingSequenceLocation"]]
+    },
+    "episodes_scenes": {
+        "key": ["seasonNum", "episodeNum", "sceneNum"],
+        "indexes": [["sceneLocation"]]
+    },
+    "episodes_characters": {
+        "key": ["seasonNum", "episodeNum", "sceneNum", "characterName"],
+        "indexes": [["characterName"]]
+    },
+    "character_relationships": {
+        "key": ["sourceCharacter", "relationship", "targetCharacter"],
+        "indexes": [["targetCharacter"], ["relationship"]]
+    },
+}
+
+default_batch_size = 5000
+
+
+def get_column_type(values, min_varchar=32):
+    """
+    Picks a MySQL type that holds every non-null value in values. Strings get
+    at least VARCHAR(min_varchar).
+    """
+    values = [v for v in values if v is not None]
+
+    if not values:
+        return f"VARCHAR({min_varchar})"
+    if all(isinstance(v, bool) for v in values):
+        return "BOOLEAN"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        if all(-2**31 <= v < 2**31 for v in values):
+            return "INT"
+        return "BIGINT"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "DOUBLE"
+    if all(isinstance(v, str) for v in values):
+        max_len = max(len(v) for v in values)
+        if max_len > 1024:
+            return "TEXT"
+        size = min_varchar
+        while size < max_len:
+            size *= 2
+        return f"VARCHAR({size})"
+
+    raise ValueError(f"Cannot map values of types {set(type(v).__name__ for v in values)} to a column type.")
+
+
+def get_columns(rows, min_varchar=32):
+    """
+    Returns {column name: MySQL type} for the extractor dicts in rows, in the
+    order the keys first appear.
+    """
+    names = {}
+    for r in rows:
+        for k in r.keys():
+            names.setdefault(k, None)
+
+    return {n: get_column_type([r.get(n, None) for r in rows], min_varchar) for n in names}
+
+
+def build_create_table(table, columns, key):
+    column_clause = [
+        f"{n} {t}" + (" NOT NULL" if n in key else " NULL") for n, t in columns.items()
+    ]
+    if key:
+        column_clause.append("PRIMARY KEY (" + ", ".join(key) + ")")
+
+    return f"CREATE TABLE {table} (" + ", ".join(column_clause) + ")"
+
+
+def build_create_index(table, index_columns):
+    index_name = table + "_" + "_".join(index_columns) + "_idx"
+    return f"CREATE INDEX {index_name} ON {table} (" + ", ".join(index_columns) + ")"
+
+
+def get_batches(rows, batch_size):
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def to_tsv_field(v):
+    if v is None:
+        return "\\N"
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    return str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def write_tsv(rows, columns, out_file):
+    for r in rows:
+        out_file.write("\t".join(to_tsv_field(r.get(c, None)) for c in columns) + "\n")
+
+
+def load_table(db, table, rows, key, indexes=None, batch_size=default_batch_size, use_infile=False,
+               type_sample_size=None):
+    """
+    Drops and recreates table with DDL inferred from rows, loads the rows and
+    then builds the secondary indexes.
+
+    By default column types are inferred from every row, so rows is read into
+    a list first. With type_sample_size, types come from the first
+    type_sample_size rows only and the rest of rows is streamed, one batch at
+    a time, without ever being held in memory. Strings are then given at least
+    VARCHAR(255), and a later value that does not fit the sampled types fails
+    the load.
+
+    :param db: A HW2 DB. use_infile requires it to be created with local_infile=True.
+    :param table: The table name.
+    :param rows: The dicts an extractor returned.
+    :param key: The primary key columns.
+    :param indexes: A list of column lists, one per secondary index.
+    :param batch_size: Rows per multi-row INSERT.
+    :param use_infile: Load through a temporary file and LOAD DATA LOCAL INFILE.
+    :param type_sample_size: Infer column types from this many leading rows and stream the rest.
+    :return: The number of rows loaded.
+    """
+    if type_sample_size is None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns = get_columns(rows)
+    else:
+        it = iter(rows)
+        sample = list(islice(it, type_sample_size))
+        columns = get_columns(sample, min_varchar=255)
+        rows = chain(sample, it)
+    column_names = list(columns.keys())
+
+    db.execute_query(f"DROP TABLE IF EXISTS {table}", [], False)
+    db.execute_query(build_create_table(table, columns, key), [], False)
+
+    if use_infile:
+        with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, encoding="utf-8") as out_file:
+            write_tsv(rows, column_names, out_file)
+        try:
+            count = db.load_data(table, column_names, out_file.name)
+        finally:
+            os.remove(out_file.name)
+    else:
+        count = 0
+        for batch in get_batches(rows, batch_size):
+            count += db.insert_many(table, column_names, batch)
+
+    for index_columns in indexes or []:
+        db.execute_query(build_create_index(table, index_columns), [], False)
+
+    return count
+
+
+def load_got_table(db, table, rows, batch_size=default_batch_size, use_infile=False,
+                   type_sample_size=None):
+    spec = got_tables[table]
+    return load_table(db, table, rows, spec["key"], spec["indexes"],
+                      batch_size=batch_size, use_infile=use_infile,
+                      type_sample_size=type_sample_size)
+
+
+def load_episodes(db, episodes, batch_size=default_batch_size, use_infile=False,
+                  type_sample_size=None):
+    extractors = {
+        "episodes_basics": get_episodes_basics,
+        "episodes_locations": get_episodes_basics_location,
+        "episodes_scenes": get_episodes_basics_scenes,
+        "episodes_characters": get_episodes_basics_scenes_characters,
+    }
+    result = {}
+
+    for table, extractor in extractors.items():
+        result[table] = load_got_table(db, table, extractor(episodes),
+                                       batch_size=batch_size, use_infile=use_infile,
+                                       type_sample_size=type_sample_size)
+
+    return result
+
+
+def load_characters_relationships(db, characters, batch_size=default_batch_size, use_infile=False,
+                                  type_sample_size=None):
+    rows = (r for c in characters for r in get_character_relationship(c))
+
+    return load_got_table(db, "character_relationships", rows,
+                          batch_size=batch_size, use_infile=use_infile,
+                          type_sample_size=type_sample_size)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "..", "..", "Homework", "HW2", "HW2 Programming", "src"))
+    from db import DB
+
+    got_db = DB(
+        host="localhost",
+        port=3306,
+        user="root",
+        password="dbuserdbuser",
+        database="s24_got",
+        local_infile=True,
+    )
+    print(load_episodes(got_db, get_episodes()))
+    print(load_characters_relationships(got_db, get_characters()))
@@ -0,0 +1,158 @@
+import unittest
+
+from load_got import get_column_type, get_columns, build_create_table, build_create_index, \
+    get_batches, to_tsv_field, load_table
+
+
+class FakeDB:
+    # Records what load_table sends instead of talking to MySQL.
+    def __init__(self):
+        self.queries = []
+        self.batches = []
+        self.infile = None
+
+    def execute_query(self, q, args, fetch):
+        self.queries.append(q)
+
+    def insert_many(self, table, columns, rows):
+        self.batches.append(rows)
+        return len(rows)
+
+    def load_data(self, table, columns, file_name):
+        with open(file_name, encoding="utf-8") as in_file:
+            self.infile = in_file.read()
+        return self.infile.count("\n")
+
+
+class LoadGotTest(unittest.TestCase):
+    def run_test_table(self, func, tests):
+        for args, want in tests:
+            self.assertEqual(want, func(*args))
+
+    def test_get_column_type(self):
+        tests = [
+            (([],), "VARCHAR(32)"),
+            (([None, None],), "VARCHAR(32)"),
+            (([True, False, None],), "BOOLEAN"),
+            (([1, 2, None],), "INT"),
+            (([1, 2**31],), "BIGINT"),
+            (([1, 2.5],), "DOUBLE"),
+            ((["a", None],), "VARCHAR(32)"),
+            ((["a" * 33],), "VARCHAR(64)"),
+            ((["a" * 33], 255), "VARCHAR(255)"),
+            ((["a" * 2000],), "TEXT"),
+        ]
+
+        self.run_test_table(get_column_type, tests)
+
+        with self.assertRaises(ValueError):
+            get_column_type([1, "a"])
+
+    def test_get_columns(self):
+        tests = [
+            (
+                ([{"a": 1, "b": "x"}, {"a": 2, "c": True}],),
+                {"a": "INT", "b": "VARCHAR(32)", "c": "BOOLEAN"}
+            ),
+            (
+                ([{"a": "x"}], 255),
+                {"a": "VARCHAR(255)"}
+            ),
+        ]
+
+        self.run_test_table(get_columns, tests)
+
+    def test_build_create_table(self):
+        tests = [
+            (
+                ("t", {"a": "INT"}, []),
+                "CREATE TABLE t (a INT NULL)"
+            ),
+            (
+                ("t", {"a": "INT", "b": "VARCHAR(32)"}, ["a"]),
+                "CREATE TABLE t (a INT NOT NULL, b VARCHAR(32) NULL, PRIMARY KEY (a))"
+            ),
+            (
+                ("t", {"a": "INT", "b": "INT", "c": "DOUBLE"}, ["a", "b"]),
+                "CREATE TABLE t (a INT NOT NULL, b INT NOT NULL, c DOUBLE NULL, PRIMARY KEY (a, b))"
+            ),
+        ]
+
+        self.run_test_table(build_create_table, tests)
+
+    def test_build_create_index(self):
+        tests = [
+            (("t", ["a"]), "CREATE INDEX t_a_idx ON t (a)"),
+            (("t", ["a", "b"]), "CREATE INDEX t_a_b_idx ON t (a, b)"),
+        ]
+
+        self.run_test_table(build_create_index, tests)
+
+    def test_get_batches(self):
+        tests = [
+            (([], 2), []),
+            (([1, 2, 3], 2), [[1, 2], [3]]),
+            ((iter([1, 2, 3, 4]), 2), [[1, 2], [3, 4]]),
+        ]
+
+        self.run_test_table(lambda rows, n: list(get_batches(rows, n)), tests)
+
+    def test_to_tsv_field(self):
+        tests = [
+            ((None,), "\\N"),
+            ((True,), "1"),
+            ((False,), "0"),
+            ((3,), "3"),
+            (("a\tb\nc\\d",), "a\\tb\\nc\\\\d"),
+        ]
+
+        self.run_test_table(to_tsv_field, tests)
+
+    def test_load_table(self):
+        db = FakeDB()
+        rows = [{"a": i, "b": str(i)} for i in range(5)]
+
+        self.assertEqual(5, load_table(db, "t", rows, ["a"], [["b"]], batch_size=2))
+        self.assertEqual([
+            "DROP TABLE IF EXISTS t",
+            "CREATE TABLE t (a INT NOT NULL, b VARCHAR(32) NULL, PRIMARY KEY (a))",
+            "CREATE INDEX t_b_idx ON t (b)",
+        ], db.queries)
+        self.assertEqual([2, 2, 1], [len(b) for b in db.batches])
+
+    def test_load_table_infile(self):
+        db = FakeDB()
+        rows = [{"a": 1, "b": None}, {"a": 2, "b": "x\ty"}]
+
+        self.assertEqual(2, load_table(db, "t", rows, ["a"], use_infile=True))
+        self.assertEqual("1\t\\N\n2\tx\\ty\n", db.infile)
+
+    def test_load_table_type_sample_size(self):
+        db = FakeDB()
+        consumed = []
+        seen = []
+        insert_many = db.insert_many
+
+        def record_insert_many(table, columns, rows):
+            seen.append(len(consumed))
+            return insert_many(table, columns, rows)
+
+        db.insert_many = record_insert_many
+
+        def rows():
+            for i in range(10):
+                consumed.append(i)
+                yield {"a": i, "b": "x" * i}
+
+        self.assertEqual(10, load_table(db, "t", rows(), ["a"], batch_size=4, type_sample_size=3))
+        # Types come from the sample, strings get at least VARCHAR(255).
+        self.assertEqual("CREATE TABLE t (a INT NOT NULL, b VARCHAR(255) NULL, PRIMARY KEY (a))",
+                         db.queries[1])
+        self.assertEqual([4, 4, 2], [len(b) for b in db.batches])
+        self.assertEqual(list(range(10)), [r["a"] for b in db.batches for r in b])
+        # The first batch went out before the rows after it were read.
+        self.assertEqual([4, 8, 10], seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import cProfile
+import datetime
+import functools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows. max_rss_kb is reported as None there.
+    resource = None
+
+
+def get_max_rss_kb():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def get_row_count(x):
+    try:
+        return len(x)
+    except TypeError:
+        return None
+
+
+class PipelineStats:
+    """
+    Records wall time, CPU time, rows in/out and memory for each stage of a
+    pipeline run, and writes them out as a JSON report.
+
+    Stats are off until enable() is called; a disabled stage costs one
+    attribute check. When enabled with trace_memory=True each stage also
+    reports its tracemalloc peak, and with a profile_dir each stage's cProfile
+    output is dumped to <profile_dir>/<stage number>-<stage name>.prof.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.profile_dir = None
+        self.profiling = False
+        # Absolute tracemalloc peaks of the stages currently running,
+        # innermost last. A nested stage resets the peak, so it hands its own
+        # peak back to the enclosing stage when it finishes.
+        self.peaks = []
+        self.started = None
+        self.stages = []
+
+    def enable(self, trace_memory=False, profile_dir=None):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.reset()
+
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reset(self):
+        self.started = datetime.datetime.now().isoformat()
+        self.stages = []
+        self.peaks = []
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Times the body of a with statement as one stage. Set "rows_out" on the
+        yielded dict to record the stage's output size.
+        """
+        if not self.enabled:
+            yield {}
+            return
+
+        record = {"name": name, "rows_in": rows_in, "rows_out": None}
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            traced_start, traced_peak = tracemalloc.get_traced_memory()
+            if self.peaks:
+                self.peaks[-1] = max(self.peaks[-1], traced_peak)
+            tracemalloc.reset_peak()
+            self.peaks.append(traced_start)
+
+        # Only one profiler can be active at a time, so a stage nested inside
+        # a profiled stage is timed but not profiled separately.
+        profiler = None
+        if self.profile_dir and not self.profiling:
+            profiler = cProfile.Profile()
+            self.profiling = True
+            profiler.enable()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall_start
+            record["cpu_s"] = time.process_time() - cpu_start
+
+            if profiler is not None:
+                profiler.disable()
+                self.profiling = False
+                file_name = f"{len(self.stages):03d}-" + \
+                            "".join(c if c.isalnum() else "_" for c in name) + ".prof"
+                record["profile"] = os.path.join(self.profile_dir, file_name)
+                profiler.dump_stats(record["profile"])
+
+            if self.trace_memory:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                traced_peak = max(self.peaks.pop(), traced_peak)
+                if self.peaks:
+                    self.peaks[-1] = max(self.peaks[-1], traced_peak)
+                record["traced_peak_kb"] = (traced_peak - traced_start) // 1024
+
+            record["max_rss_kb"] = get_max_rss_kb()
+            self.stages.append(record)
+
+    def instrument(self, name=None):
+        """
+        Decorator that runs each call of a function as a stage. rows_in is the
+        length of the first argument and rows_out the length of the result,
+        where those have one.
+        """
+        def decorator(f):
+            stage_name = name or f.__name__
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return f(*args, **kwargs)
+
+                rows_in = get_row_count(args[0]) if args else None
+                with self.stage(stage_name, rows_in=rows_in) as record:
+                    result = f(*args, **kwargs)
+                    record["rows_out"] = get_row_count(result)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def report(self):
+        return {
+            "started": self.started,
+            "argv": sys.argv,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trace_memory": self.trace_memory,
+            "stages": self.stages,
+        }
+
+    def write_report(self, file_name="process_got_report.json"):
+        with open(file_name, "w") as out_file:
+            json.dump(self.report(), out_file, indent=2)
+
+
+stats = PipelineStats()
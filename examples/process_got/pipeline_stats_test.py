@@ -0,0 +1,144 @@
+import json
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+
+from pipeline_stats import PipelineStats, get_row_count
+
+
+def allocate(n):
+    # A list of n distinct ints, roughly 36 bytes each.
+    return list(range(1000, 1000 + n))
+
+
+class PipelineStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.stats = PipelineStats()
+
+    def tearDown(self):
+        self.stats.disable()
+
+    def test_get_row_count(self):
+        tests = [
+            (([1, 2],), 2),
+            (({},), 0),
+            ((None,), None),
+            ((3,), None),
+        ]
+
+        for args, want in tests:
+            self.assertEqual(want, get_row_count(*args))
+
+    def test_disabled(self):
+        @self.stats.instrument()
+        def f(rows):
+            return rows[:1]
+
+        with self.stats.stage("s") as record:
+            record["rows_out"] = 1
+        self.assertEqual([1], f([1, 2]))
+        self.assertEqual([], self.stats.stages)
+
+    def test_nested_stages(self):
+        self.stats.enable()
+
+        with self.stats.stage("outer", rows_in=3) as outer:
+            with self.stats.stage("inner"):
+                pass
+            outer["rows_out"] = 2
+
+        # A stage is recorded when it finishes, so inner comes first.
+        self.assertEqual(["inner", "outer"], [s["name"] for s in self.stats.stages])
+        inner, outer = self.stats.stages
+        self.assertEqual((3, 2), (outer["rows_in"], outer["rows_out"]))
+        self.assertEqual((None, None), (inner["rows_in"], inner["rows_out"]))
+        self.assertLessEqual(inner["wall_s"], outer["wall_s"])
+        for s in self.stats.stages:
+            self.assertGreaterEqual(s["cpu_s"], 0)
+            self.assertNotIn("traced_peak_kb", s)
+            self.assertNotIn("profile", s)
+
+    def test_stage_exception(self):
+        self.stats.enable()
+
+        with self.assertRaises(ValueError):
+            with self.stats.stage("failing"):
+                raise ValueError("boom")
+        self.assertEqual(["failing"], [s["name"] for s in self.stats.stages])
+
+    def test_instrument(self):
+        self.stats.enable()
+
+        @self.stats.instrument()
+        def first(rows):
+            return rows[:1]
+
+        @self.stats.instrument("named")
+        def no_args():
+            return 5
+
+        self.assertEqual([1], first([1, 2, 3]))
+        self.assertEqual(5, no_args())
+        self.assertEqual("first", first.__name__)
+        self.assertEqual([
+            ("first", 3, 1),
+            ("named", None, None),
+        ], [(s["name"], s["rows_in"], s["rows_out"]) for s in self.stats.stages])
+
+    def test_trace_memory_peaks(self):
+        self.stats.enable(trace_memory=True)
+
+        with self.stats.stage("outer"):
+            with self.stats.stage("big"):
+                x = allocate(100000)
+                del x
+            with self.stats.stage("small"):
+                y = allocate(1000)
+                del y
+
+        self.assertTrue(tracemalloc.is_tracing())
+        peaks = {s["name"]: s["traced_peak_kb"] for s in self.stats.stages}
+        self.assertGreater(peaks["big"], 2000)
+        # The sibling after big starts from a reset peak.
+        self.assertLess(peaks["small"], 200)
+        # The enclosing stage still sees the peak of the nested one.
+        self.assertGreaterEqual(peaks["outer"], peaks["big"])
+
+        self.stats.disable()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_profile_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_dir = os.path.join(tmp, "profiles")
+            self.stats.enable(profile_dir=profile_dir)
+
+            with self.stats.stage("read file.json"):
+                with self.stats.stage("nested"):
+                    allocate(10)
+
+            inner, outer = self.stats.stages
+            # Only the outermost stage is profiled.
+            self.assertNotIn("profile", inner)
+            self.assertEqual(os.path.join(profile_dir, "001-read_file_json.prof"), outer["profile"])
+            self.assertGreater(pstats.Stats(outer["profile"]).total_calls, 0)
+
+    def test_write_report(self):
+        self.stats.enable()
+        with self.stats.stage("s", rows_in=1):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "report.json")
+            self.stats.write_report(file_name)
+            with open(file_name, "r") as in_file:
+                report = json.load(in_file)
+
+        self.assertEqual(self.stats.started, report["started"])
+        self.assertFalse(report["trace_memory"])
+        self.assertEqual([("s", 1)], [(s["name"], s["rows_in"]) for s in report["stages"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
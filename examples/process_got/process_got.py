@@ -1,13 +1,20 @@
 import json
+import time
+
+import numpy as np
 import pandas as pd
 
+from got_records import LocationRecord, SceneRecord, SceneCharacterRecord, \
+    RelationshipRecord, record_to_json
+from pipeline_stats import stats, get_row_count
+
 
 character_relationships = [
  'abducted',
  'abductedBy',
  'allies',
  'guardedBy',
- 'guardianOf'
+ 'guardianOf',
  'killed',
  'killedBy',
  'marriedEngaged',
@@ -35,21 +42,43 @@ character_properties = [
 
 def get_json_from_file(file_name, top_element_remove=None):
 
-    with open(file_name, "r") as in_file:
-        result = json.load(in_file)
+    # Read and parse are separate stages so that the run report shows which
+    # one the time goes to.
+    with stats.stage("read " + file_name):
+        with open(file_name, "r") as in_file:
+            text = in_file.read()
+
+    with stats.stage("parse " + file_name) as record:
+        result = json.loads(text)
 
         if top_element_remove:
             result = result[top_element_remove]
+        record["rows_out"] = get_row_count(result)
 
     return result
 
 
+def write_json_file(rows, file_name):
+    with stats.stage("write " + file_name, rows_in=get_row_count(rows)):
+        with open(file_name, "w") as out_file:
+            json.dump(rows, out_file, indent=2, default=record_to_json)
+
+
+def write_json_frame(df, file_name):
+    # Serializes the frame column by column in pandas' C writer, without
+    # building a dict per row. The text differs from json.dump's ("/" is
+    # escaped, no space after ":") but parses to the same rows.
+    with stats.stage("write " + file_name, rows_in=len(df)):
+        df.to_json(file_name, orient="records", indent=2)
+
+
 def get_episodes():
     fn = "/Users/donaldferguson/Dropbox/000/000-Data/GoT/episodes.json"
     result = get_json_from_file(fn, "episodes")
     return result
 
 
+@stats.instrument()
 def get_episodes_basics(episodes):
 
     basic_keys = ['seasonNum', 'episodeNum', 'episodeTitle', 'episodeLink',
@@ -63,6 +92,7 @@ def get_episodes_basics(episodes):
 
     return result
 
+@stats.instrument()
 def get_episodes_basics_location(episodes):
 
     result = []
@@ -72,15 +102,12 @@ def get_episodes_basics_location(episodes):
 
         if locations:
             for l in locations:
-                new_l = {
-                    "seasonNum": e["seasonNum"],
-                    "episodeNum": e["episodeNum"],
-                    "openingSequenceLocation": l
-                }
+                new_l = LocationRecord(e["seasonNum"], e["episodeNum"], l)
                 result.append(new_l)
 
     return result
 
+@stats.instrument()
 def get_episodes_basics_scenes(episodes):
 
     result = []
@@ -91,21 +118,21 @@ def get_episodes_basics_scenes(episodes):
         if scenes:
             for i in range(0, len(scenes)):
                 t = scenes[i]
-                new_s = {
-                    "seasonNum": e["seasonNum"],
-                    "episodeNum": e["episodeNum"],
-                    "sceneNum": i,
-                    "sceneStart": t["sceneStart"],
-                    "sceneEnd": t["sceneEnd"],
-                    "sceneLocation": t.get("location", None),
-                    "sceneSubLocation": t.get("subLocation", None)
-
-                }
+                new_s = SceneRecord(
+                    e["seasonNum"],
+                    e["episodeNum"],
+                    i,
+                    t["sceneStart"],
+                    t["sceneEnd"],
+                    t.get("location", None),
+                    t.get("subLocation", None)
+                )
                 result.append(new_s)
 
     return result
 
 
+@stats.instrument()
 def get_episodes_basics_scenes_characters(episodes):
 
     result = []
@@ -119,43 +146,191 @@ def get_episodes_basics_scenes_characters(episodes):
                 characters = t.get('characters', None)
 
                 for c in characters:
-                    new_c = {
-                        "seasonNum": e["seasonNum"],
-                        "episodeNum": e["episodeNum"],
-                        "sceneNum": i,
-                        "characterName": c["name"]
-                    }
+                    new_c = SceneCharacterRecord(e["seasonNum"], e["episodeNum"], i, c["name"])
                     result.append(new_c)
 
     return result
 
 
+# DataFrame versions of the extractors above. Each one produces the same rows
+# as the loop version, as a typed frame, by exploding or repeating over the
+# nested scenes and characters arrays instead of building a dict per row.
+# write_json_frame writes a frame straight to JSON. get_frame_records turns a
+# frame back into the loop version's dicts, which costs more than the loop
+# itself, so it is only for checking and for callers that need dicts.
+
+episode_key_dtypes = {"seasonNum": "int16", "episodeNum": "int16"}
+
+
+def none_for_missing(df):
+    # Missing values become None, which is what the loop versions emit.
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+@stats.instrument()
+def get_frame_records(df):
+    return none_for_missing(df).to_dict("records")
+
+
+@stats.instrument()
+def get_episodes_basics_df(episodes):
+
+    basic_keys = ['seasonNum', 'episodeNum', 'episodeTitle', 'episodeLink',
+                  'episodeAirDate', 'episodeDescription'
+                  ]
+    result = pd.DataFrame.from_records(episodes, columns=basic_keys)
+    return result.astype(episode_key_dtypes)
+
+
+@stats.instrument()
+def get_episodes_basics_location_df(episodes):
+
+    result = pd.DataFrame.from_records(
+        episodes, columns=["seasonNum", "episodeNum", "openingSequenceLocations"])
+    result = result.explode("openingSequenceLocations", ignore_index=True)
+    result = result.dropna(subset=["openingSequenceLocations"], ignore_index=True)
+    result = result.rename(columns={"openingSequenceLocations": "openingSequenceLocation"})
+    return result.astype(episode_key_dtypes)
+
+
+def get_list_lengths(lists):
+    return np.fromiter((len(x) if isinstance(x, list) else 0 for x in lists),
+                       dtype=np.int64, count=len(lists))
+
+
+def get_scenes_df(episodes):
+    # One row per scene with its episode key, sceneNum and the raw scene dict.
+    # Episode keys are repeated once per scene and sceneNum is a running count
+    # restarted at each episode, so there is no explode or groupby.
+    frame = pd.DataFrame.from_records(episodes, columns=["seasonNum", "episodeNum", "scenes"])
+    scenes = frame["scenes"].tolist()
+    counts = get_list_lengths(scenes)
+    starts = np.cumsum(counts) - counts
+
+    return pd.DataFrame({
+        "seasonNum": np.repeat(frame["seasonNum"].to_numpy(np.int16), counts),
+        "episodeNum": np.repeat(frame["episodeNum"].to_numpy(np.int16), counts),
+        "sceneNum": (np.arange(counts.sum()) - np.repeat(starts, counts)).astype(np.int16),
+        "scenes": [t for x in scenes if isinstance(x, list) for t in x],
+    })
+
+
+@stats.instrument()
+def get_episodes_basics_scenes_df(episodes):
+
+    scenes = get_scenes_df(episodes)
+    details = pd.DataFrame.from_records(
+        scenes["scenes"].tolist(), columns=["sceneStart", "sceneEnd", "location", "subLocation"])
+
+    return pd.DataFrame({
+        "seasonNum": scenes["seasonNum"],
+        "episodeNum": scenes["episodeNum"],
+        "sceneNum": scenes["sceneNum"],
+        "sceneStart": details["sceneStart"],
+        "sceneEnd": details["sceneEnd"],
+        "sceneLocation": details["location"],
+        "sceneSubLocation": details["subLocation"],
+    })
+
+
+@stats.instrument()
+def get_episodes_basics_scenes_characters_df(episodes):
+
+    scenes = get_scenes_df(episodes)
+    characters = [t.get("characters", None) for t in scenes["scenes"]]
+    counts = get_list_lengths(characters)
+
+    # Repeat each scene key once per character in the scene, then line the
+    # names up against them.
+    return pd.DataFrame({
+        "seasonNum": np.repeat(scenes["seasonNum"].to_numpy(), counts),
+        "episodeNum": np.repeat(scenes["episodeNum"].to_numpy(), counts),
+        "sceneNum": np.repeat(scenes["sceneNum"].to_numpy(), counts),
+        "characterName": [c["name"] for x in characters if isinstance(x, list) for c in x],
+    })
+
+
+def time_call(f, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = f()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def benchmark_extractors(episodes, repeat=5):
+    """
+    Times each loop extractor against its DataFrame version and checks that
+    both produce identical rows and identical JSON.
+
+    "loop" and "frame" time extraction only, "frame_records" adds converting
+    the frame back to dicts, and "loop_json"/"frame_json" time extraction plus
+    serializing to JSON the way process_* writes the files.
+
+    :return: {extractor name: {"loop": seconds, "frame": seconds, "frame_records": seconds,
+        "loop_json": seconds, "frame_json": seconds, "rows": row count}}
+    """
+    extractors = [
+        (get_episodes_basics, get_episodes_basics_df),
+        (get_episodes_basics_location, get_episodes_basics_location_df),
+        (get_episodes_basics_scenes, get_episodes_basics_scenes_df),
+        (get_episodes_basics_scenes_characters, get_episodes_basics_scenes_characters_df),
+    ]
+    result = {}
+
+    for loop_f, frame_f in extractors:
+        loop_time, loop_rows = time_call(lambda: loop_f(episodes), repeat)
+        frame_time, frame = time_call(lambda: frame_f(episodes), repeat)
+        records_time, records = time_call(lambda: get_frame_records(frame_f(episodes)), repeat)
+        loop_json_time, loop_json = time_call(
+            lambda: json.dumps(loop_f(episodes), indent=2, default=record_to_json), repeat)
+        frame_json_time, frame_json = time_call(
+            lambda: frame_f(episodes).to_json(orient="records", indent=2), repeat)
+
+        if records != loop_rows or json.loads(frame_json) != json.loads(loop_json):
+            raise ValueError(f"{frame_f.__name__} does not match {loop_f.__name__}")
+
+        result[loop_f.__name__] = {
+            "loop": loop_time,
+            "frame": frame_time,
+            "frame_records": records_time,
+            "loop_json": loop_json_time,
+            "frame_json": frame_json_time,
+            "rows": len(loop_rows),
+        }
+
+    return result
+
+
+
+# The per-episode tables only have a few hundred rows, where building a frame
+# costs more than the loop, so only the per-scene tables take use_frames.
 
 def process_episodes():
     episodes = get_episodes()
     episodes_basics = get_episodes_basics(episodes)
-    with open("episodes_basics.json", "w") as out_file:
-        json.dump(episodes_basics, out_file, indent=2)
+    write_json_file(episodes_basics, "episodes_basics.json")
 
 def process_locations():
     episodes = get_episodes()
     episodes_locations = get_episodes_basics_location(episodes)
-    with open("episodes_locations.json", "w") as out_file:
-        json.dump(episodes_locations, out_file, indent=2)
+    write_json_file(episodes_locations, "episodes_locations.json")
 
 
-def process_scenes():
+def process_scenes(use_frames=False):
     episodes = get_episodes()
-    scenes = get_episodes_basics_scenes(episodes)
-    with open("episodes_scenes.json", "w") as out_file:
-        json.dump(scenes, out_file, indent=2)
+    if use_frames:
+        write_json_frame(get_episodes_basics_scenes_df(episodes), "episodes_scenes.json")
+    else:
+        write_json_file(get_episodes_basics_scenes(episodes), "episodes_scenes.json")
 
 
-def process_episodes_characters():
+def process_episodes_characters(use_frames=False):
     episodes = get_episodes()
-    characters = get_episodes_basics_scenes_characters(episodes)
-    with open("episodes_characters.json", "w") as out_file:
-        json.dump(characters, out_file, indent=2)
+    if use_frames:
+        write_json_frame(get_episodes_basics_scenes_characters_df(episodes), "episodes_characters.json")
+    else:
+        write_json_file(get_episodes_basics_scenes_characters(episodes), "episodes_characters.json")
 
 
 def get_characters():
@@ -164,6 +339,7 @@ def get_characters():
     return result
 
 
+@stats.instrument()
 def get_characters_basics(characters):
 
     basic_keys = character_properties
@@ -178,8 +354,7 @@ def get_characters_basics(characters):
 def process_characters_core():
     the_characters = get_characters()
     the_characters = get_characters_basics(the_characters)
-    with open("characters_basic.json", "w") as out_file:
-        json.dump(the_characters, out_file, indent=2)
+    write_json_file(the_characters, "characters_basic.json")
 
 
 def get_character_relationship(c):
@@ -192,11 +367,7 @@ def get_character_relationship(c):
         related_characters = c.get(r, None)
         if related_characters:
             for t in related_characters:
-                new_r = {
-                    "sourceCharacter": source_character,
-                    "relationship": r,
-                    "targetCharacter": t
-                }
+                new_r = RelationshipRecord(source_character, r, t)
                 result.append(new_r)
 
     return result
@@ -206,12 +377,13 @@ def process_characters_relationships():
     the_characters = get_characters()
     result = []
 
-    for c in the_characters:
-        tmp = get_character_relationship(c)
-        result.extend(tmp)
+    with stats.stage("get_character_relationship", rows_in=len(the_characters)) as record:
+        for c in the_characters:
+            tmp = get_character_relationship(c)
+            result.extend(tmp)
+        record["rows_out"] = len(result)
 
-    with open("character_relationships.json", "w") as out_file:
-        json.dump(result, out_file, indent=2)
+    write_json_file(result, "character_relationships.json")
 
 
 if __name__ == "__main__":
@@ -220,5 +392,7 @@ if __name__ == "__main__":
     # process_scenes()
     # process_episodes_characters()
     # process_characters_core()
+    stats.enable()
     process_characters_relationships()
+    stats.write_report()
 
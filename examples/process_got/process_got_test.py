@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+
+import process_got
+
+
+def scene(start, location, characters, sub_location=None):
+    result = {"sceneStart": start, "sceneEnd": start, "location": location, "characters": characters}
+    if sub_location is not None:
+        result["subLocation"] = sub_location
+    return result
+
+
+# Covers what the loop versions handle specially: no scenes, a scene with no
+# characters, a missing subLocation, and text json escapes.
+episodes = [
+    {
+        "seasonNum": 1, "episodeNum": 1, "episodeTitle": "Winter Is Coming",
+        "episodeLink": "/title/tt1480055/", "episodeAirDate": "2011-04-17",
+        "episodeDescription": "Lord Stark's \"hand\"",
+        "openingSequenceLocations": ["King's Landing", "Winterfell"],
+        "scenes": [
+            scene("0:00:40", "The Wall", [{"name": "Gared"}, {"name": "Will"}], "Castle Black"),
+            scene("0:01:45", "North of the Wall", []),
+            scene("0:02:10", "Winterfell", [{"name": "Daenerys Targaryen"}, {"name": "Jaqen H'ghar"}]),
+        ],
+    },
+    {
+        "seasonNum": 1, "episodeNum": 2, "episodeTitle": "The Kingsroad",
+        "episodeLink": "/title/tt1668746/", "episodeAirDate": "2011-04-24",
+        "episodeDescription": "Smörgåsbord",
+    },
+    {
+        "seasonNum": 2, "episodeNum": 1, "episodeTitle": "The North Remembers",
+        "episodeLink": "/title/tt1971833/", "episodeAirDate": "2012-04-01",
+        "episodeDescription": "", "openingSequenceLocations": ["Dragonstone"],
+        "scenes": [scene("0:00:00", "Dragonstone", [{"name": "Stannis Baratheon"}], "Beach")],
+    },
+]
+
+
+class ProcessGotTest(unittest.TestCase):
+    def test_frames_match_loops(self):
+        tests = [
+            (process_got.get_episodes_basics, process_got.get_episodes_basics_df),
+            (process_got.get_episodes_basics_location, process_got.get_episodes_basics_location_df),
+            (process_got.get_episodes_basics_scenes, process_got.get_episodes_basics_scenes_df),
+            (process_got.get_episodes_basics_scenes_characters, process_got.get_episodes_basics_scenes_characters_df),
+        ]
+
+        for loop_f, frame_f in tests:
+            self.assertEqual(loop_f(episodes), process_got.get_frame_records(frame_f(episodes)), loop_f.__name__)
+
+    def test_write_json_frame(self):
+        tests = [
+            (process_got.get_episodes_basics_scenes, process_got.get_episodes_basics_scenes_df),
+            (process_got.get_episodes_basics_scenes_characters, process_got.get_episodes_basics_scenes_characters_df),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            loop_file = os.path.join(tmp, "loop.json")
+            frame_file = os.path.join(tmp, "frame.json")
+            for loop_f, frame_f in tests:
+                process_got.write_json_file(loop_f(episodes), loop_file)
+                process_got.write_json_frame(frame_f(episodes), frame_file)
+
+                with open(loop_file, "r") as loop_in, open(frame_file, "r") as frame_in:
+                    self.assertEqual(json.load(loop_in), json.load(frame_in), loop_f.__name__)
+
+    def test_benchmark_extractors(self):
+        result = process_got.benchmark_extractors(episodes, repeat=1)
+
+        self.assertEqual(4, result["get_episodes_basics_scenes"]["rows"])
+        self.assertEqual(5, result["get_episodes_basics_scenes_characters"]["rows"])
+        for timings in result.values():
+            self.assertEqual({"loop", "frame", "frame_records", "loop_json", "frame_json", "rows"}, set(timings))
+
+
+if __name__ == '__main__':
+    unittest.main()
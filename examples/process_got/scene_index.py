@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def get_seconds(t):
+    """
+    Converts a sceneStart/sceneEnd string such as "0:01:45" to seconds.
+    """
+    seconds = 0
+    for part in t.split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+class SceneIndex:
+    """
+    Inverted index from character to the scenes they appear in.
+
+    Scenes are numbered 0..n-1 in (seasonNum, episodeNum, sceneNum) order.
+    Every character's posting list is a sorted, duplicate free slice of one
+    postings array: postings[offsets[i]:offsets[i + 1]] for character i.
+    durations[scene] is the scene length in seconds.
+    """
+
+    def __init__(self, scene_keys, durations, names, offsets, postings):
+        self.scene_keys = scene_keys
+        self.durations = durations
+        self.names = names
+        self.ids = {n: i for i, n in enumerate(names)}
+        self.offsets = offsets
+        self.postings = postings
+
+    @classmethod
+    def build(cls, scenes, scene_characters):
+        """
+        :param scenes: The rows get_episodes_basics_scenes returns.
+        :param scene_characters: The rows get_episodes_basics_scenes_characters returns.
+        """
+        scenes = sorted(scenes, key=lambda s: (s["seasonNum"], s["episodeNum"], s["sceneNum"]))
+        scene_keys = np.array([[s["seasonNum"], s["episodeNum"], s["sceneNum"]] for s in scenes],
+                              dtype=np.int32).reshape(-1, 3)
+        durations = np.array([get_seconds(s["sceneEnd"]) - get_seconds(s["sceneStart"]) for s in scenes],
+                             dtype=np.int32)
+        scene_ids = {tuple(k): i for i, k in enumerate(scene_keys.tolist())}
+
+        by_character = {}
+        for c in scene_characters:
+            scene = scene_ids[(c["seasonNum"], c["episodeNum"], c["sceneNum"])]
+            by_character.setdefault(c["characterName"], []).append(scene)
+
+        names = sorted(by_character.keys())
+        lists = [np.unique(np.array(by_character[n], dtype=np.int32)) for n in names]
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in lists])
+        postings = np.concatenate(lists) if lists else np.zeros(0, dtype=np.int32)
+
+        return cls(scene_keys, durations, names, offsets, postings)
+
+    @classmethod
+    def from_files(cls, scenes_file="episodes_scenes.json", characters_file="episodes_characters.json"):
+        with open(scenes_file, "r") as in_file:
+            scenes = json.load(in_file)
+        with open(characters_file, "r") as in_file:
+            scene_characters = json.load(in_file)
+
+        return cls.build(scenes, scene_characters)
+
+    def save(self, file_name="scene_index.npz"):
+        np.savez(file_name, scene_keys=self.scene_keys, durations=self.durations,
+                 names=np.array(self.names, dtype=str), offsets=self.offsets, postings=self.postings)
+
+    @classmethod
+    def load(cls, file_name="scene_index.npz"):
+        with np.load(file_name, allow_pickle=False) as data:
+            return cls(data["scene_keys"], data["durations"], data["names"].tolist(),
+                       data["offsets"], data["postings"])
+
+    def get_postings(self, name):
+        i = self.ids.get(name, None)
+        if i is None:
+            return np.zeros(0, dtype=self.postings.dtype)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def scenes_with_all(self, names):
+        """
+        :return: The sorted scene ids where every character in names appears.
+        """
+        lists = sorted((self.get_postings(n) for n in names), key=len)
+        if not lists:
+            return np.zeros(0, dtype=self.postings.dtype)
+
+        # Intersecting shortest first keeps every intermediate result small.
+        result = lists[0]
+        for p in lists[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, p, assume_unique=True)
+
+        return result
+
+    def scenes_with_any(self, names):
+        """
+        :return: The sorted scene ids where at least one character in names appears.
+        """
+        lists = [self.get_postings(n) for n in names]
+        if not lists:
+            return np.zeros(0, dtype=self.postings.dtype)
+        return np.unique(np.concatenate(lists))
+
+    def get_scenes(self, scene_ids):
+        """
+        :return: A DataFrame with seasonNum, episodeNum, sceneNum and duration for each scene id.
+        """
+        keys = self.scene_keys[scene_ids]
+        return pd.DataFrame({
+            "seasonNum": keys[:, 0],
+            "episodeNum": keys[:, 1],
+            "sceneNum": keys[:, 2],
+            "duration": self.durations[scene_ids],
+        })
+
+    def screen_time(self, by_episode=False):
+        """
+        Total seconds on screen for every character, per season or per episode.
+
+        :return: A DataFrame with characterName, seasonNum, [episodeNum,] seconds.
+        """
+        # Expand the CSR into one (character, scene) pair per posting, then
+        # sum durations per group with a single bincount.
+        characters = np.repeat(np.arange(len(self.names)), np.diff(self.offsets))
+        keys = self.scene_keys[self.postings]
+        group_columns = [keys[:, 0], keys[:, 1]] if by_episode else [keys[:, 0]]
+
+        groups, group_ids = np.unique(np.column_stack([characters] + group_columns),
+                                      axis=0, return_inverse=True)
+        seconds = np.bincount(group_ids.ravel(), weights=self.durations[self.postings],
+                              minlength=len(groups))
+
+        result = {
+            "characterName": np.array(self.names, dtype=object)[groups[:, 0]],
+            "seasonNum": groups[:, 1],
+        }
+        if by_episode:
+            result["episodeNum"] = groups[:, 2]
+        result["seconds"] = seconds.astype(np.int64)
+
+        return pd.DataFrame(result)
+
+
+if __name__ == "__main__":
+    index = SceneIndex.from_files()
+    index.save()
+    index = SceneIndex.load()
+    print(index.get_scenes(index.scenes_with_all(["Arya Stark", "Sandor Clegane"])))
+    print(index.screen_time().sort_values("seconds", ascending=False).head(20))
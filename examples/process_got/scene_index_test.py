@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import unittest
+
+from scene_index import SceneIndex, get_seconds
+
+data_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def scene(season, episode, number, start, end):
+    return {"seasonNum": season, "episodeNum": episode, "sceneNum": number,
+            "sceneStart": start, "sceneEnd": end}
+
+
+def appearance(season, episode, number, name):
+    return {"seasonNum": season, "episodeNum": episode, "sceneNum": number, "characterName": name}
+
+
+# Given out of order, with a duplicate appearance.
+scenes = [
+    scene(1, 2, 0, "0:00:00", "0:01:00"),
+    scene(1, 1, 1, "0:01:00", "0:01:30"),
+    scene(1, 1, 0, "0:00:00", "0:01:00"),
+    scene(2, 1, 0, "0:00:00", "1:00:00"),
+]
+scene_characters = [
+    appearance(1, 1, 0, "Arya"),
+    appearance(1, 1, 0, "Jon"),
+    appearance(1, 1, 1, "Arya"),
+    appearance(1, 1, 1, "Arya"),
+    appearance(1, 2, 0, "Jon"),
+    appearance(2, 1, 0, "Arya"),
+    appearance(2, 1, 0, "Jon"),
+    appearance(2, 1, 0, "Sandor"),
+]
+
+
+class SceneIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SceneIndex.build(scenes, scene_characters)
+
+    def test_get_seconds(self):
+        tests = [
+            (("0:00:40",), 40),
+            (("0:01:45",), 105),
+            (("1:02:03",), 3723),
+        ]
+
+        for args, want in tests:
+            self.assertEqual(want, get_seconds(*args))
+
+    def test_build(self):
+        self.assertEqual([[1, 1, 0], [1, 1, 1], [1, 2, 0], [2, 1, 0]], self.index.scene_keys.tolist())
+        self.assertEqual([60, 30, 60, 3600], self.index.durations.tolist())
+        self.assertEqual(["Arya", "Jon", "Sandor"], self.index.names)
+        self.assertEqual([0, 1, 3], self.index.get_postings("Arya").tolist())
+
+    def test_scenes_with_all(self):
+        tests = [
+            ([], []),
+            (["Arya"], [0, 1, 3]),
+            (["Arya", "Jon"], [0, 3]),
+            (["Jon", "Arya", "Sandor"], [3]),
+            (["Arya", "Nobody"], []),
+        ]
+
+        for names, want in tests:
+            self.assertEqual(want, self.index.scenes_with_all(names).tolist(), names)
+
+    def test_scenes_with_any(self):
+        tests = [
+            ([], []),
+            (["Sandor"], [3]),
+            (["Arya", "Jon"], [0, 1, 2, 3]),
+            (["Nobody", "Sandor"], [3]),
+        ]
+
+        for names, want in tests:
+            self.assertEqual(want, self.index.scenes_with_any(names).tolist(), names)
+
+    def test_get_scenes(self):
+        frame = self.index.get_scenes([0, 3])
+
+        self.assertEqual(["seasonNum", "episodeNum", "sceneNum", "duration"], list(frame.columns))
+        self.assertEqual([[1, 1, 0, 60], [2, 1, 0, 3600]], frame.values.tolist())
+
+    def test_screen_time(self):
+        self.assertEqual([
+            ["Arya", 1, 90], ["Arya", 2, 3600],
+            ["Jon", 1, 120], ["Jon", 2, 3600],
+            ["Sandor", 2, 3600],
+        ], self.index.screen_time().values.tolist())
+        self.assertEqual([
+            ["Arya", 1, 1, 90], ["Arya", 2, 1, 3600],
+            ["Jon", 1, 1, 60], ["Jon", 1, 2, 60], ["Jon", 2, 1, 3600],
+            ["Sandor", 2, 1, 3600],
+        ], self.index.screen_time(by_episode=True).values.tolist())
+
+    def test_screen_time_matches_scan(self):
+        index = SceneIndex.from_files(os.path.join(data_dir, "episodes_scenes.json"),
+                                      os.path.join(data_dir, "episodes_characters.json"))
+        with open(os.path.join(data_dir, "episodes_scenes.json"), "r") as in_file:
+            durations = {
+                (s["seasonNum"], s["episodeNum"], s["sceneNum"]): get_seconds(s["sceneEnd"]) - get_seconds(s["sceneStart"])
+                for s in json.load(in_file)
+            }
+        with open(os.path.join(data_dir, "episodes_characters.json"), "r") as in_file:
+            appearances = {(c["characterName"], c["seasonNum"], c["episodeNum"], c["sceneNum"])
+                           for c in json.load(in_file)}
+
+        want = {}
+        for name, season, episode, number in appearances:
+            k = (name, season, episode)
+            want[k] = want.get(k, 0) + durations[(season, episode, number)]
+
+        got = {(r[0], r[1], r[2]): r[3] for r in index.screen_time(by_episode=True).values.tolist()}
+        self.assertEqual(want, got)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "scene_index.npz")
+            self.index.save(file_name)
+            loaded = SceneIndex.load(file_name)
+
+        self.assertEqual(self.index.names, loaded.names)
+        for field in ("scene_keys", "durations", "offsets", "postings"):
+            self.assertEqual(getattr(self.index, field).tolist(), getattr(loaded, field).tolist(), field)
+        self.assertEqual([0, 3], loaded.scenes_with_all(["Arya", "Jon"]).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()